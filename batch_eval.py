@@ -0,0 +1,122 @@
+"""Evaluation of many positions at once with NumPy.
+
+Positions of the game (n, k) are rows of an (N, cells) int8 array: one
+column per field in the order of windows.board_fields, 0 for an empty field,
+1 for o and 2 for x (positions_array converts boards). Numbers of symbols of
+every player in every window are computed for a whole chunk of positions by
+a single multiplication by the window incidence matrix (cells x windows),
+and heuristics, winners and draws follow from the counts. Results are the
+same as returned by heuristics, winner and is_draw for every board.
+
+    result = batch_evaluate(positions, n, k, 'o')
+    result.heuristics, result.winners, result.draws
+
+Positions are processed in chunks of chunk_size rows, so positions can be
+e.g. a numpy.memmap of a file much bigger than memory.
+"""
+import collections
+import functools
+
+import numpy
+
+from windows import board_fields, field_index, winning_windows
+
+DIGITS = {'.': 0, 'o': 1, 'x': 2}
+WINNERS = (None, 'o', 'x', '.')  # values of winner for codes in winners
+
+BatchResult = collections.namedtuple('BatchResult',
+                                     'heuristics winners draws')
+# heuristics - float64 array of heuristics values (with infinities),
+# winners - int8 array of codes of winners (see WINNERS),
+# draws - bool array of results of is_draw.
+
+
+@functools.lru_cache(maxsize=None)
+def window_matrix(n, k):
+    """Returns the incidence matrix of fields and windows of the game:
+    float32 array (cells x windows), 1 where the field belongs to the
+    window. """
+    windows = winning_windows(n, k)
+    matrix = numpy.zeros((len(board_fields(n)), len(windows)), numpy.float32)
+    for (number, window) in enumerate(windows):
+        for field in window:
+            matrix[field_index(n, field), number] = 1
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _trigger_field(window):
+    """Returns the field of the full window at which winner finds the line:
+    winner scans fields in row-major order looking for lines ending at the
+    field on the left, below, above on the left or below on the left. """
+    (i, j), (i_last, j_last) = window[0], window[-1]
+    if i == i_last or (i_last < i and j_last < j):
+        return max(window)  # horizontal or up-left: the last field
+    return min(window)  # vertical or down-left: the first field
+
+
+@functools.lru_cache(maxsize=None)
+def winner_order(n, k):
+    """Returns the array of numbers of windows in the order in which winner
+    finds lines on the board. """
+    windows = winning_windows(n, k)
+    order = sorted(range(len(windows)),
+                   key=lambda number: _trigger_field(windows[number]))
+    result = numpy.array(order, numpy.intp)
+    result.flags.writeable = False
+    return result
+
+
+def positions_array(boards):
+    """Returns the (N, cells) int8 array of positions of boards (lists or
+    BitBoards) of the same size. """
+    boards = [board if isinstance(board, list) else board.to_board()
+              for board in boards]
+    if not boards:
+        return numpy.zeros((0, 0), numpy.int8)
+    fields = board_fields(len(boards[0]))
+    return numpy.array([[DIGITS[board[i][j]] for (i, j) in fields]
+                        for board in boards], numpy.int8)
+
+
+def batch_evaluate(positions, n, k, ox='o', chunk_size=1 << 16):
+    """Returns BatchResult of positions (an (N, cells) array) of the game
+    (n, k): values of heuristics(board, k, ox), winner(board, k) and
+    is_draw(board, k) of every position. """
+    positions = numpy.asarray(positions)
+    cells = n * (n + 1) // 2
+    if positions.ndim != 2 or positions.shape[1] != cells:
+        raise Exception("Positions must be an array of shape (N, %i)."
+                        % cells)
+    matrix = window_matrix(n, k)
+    order = winner_order(n, k)
+    count = len(positions)
+    heuristics = numpy.empty(count, numpy.float64)
+    winners = numpy.empty(count, numpy.int8)
+    draws = numpy.empty(count, bool)
+    for start in range(0, count, chunk_size):
+        chunk = positions[start:start + chunk_size]
+        stop = start + len(chunk)
+        o_counts = (chunk == 1).astype(numpy.float32) @ matrix
+        x_counts = (chunk == 2).astype(numpy.float32) @ matrix
+        alive = (o_counts == 0) | (x_counts == 0)
+        values = ((o_counts - x_counts) * alive).sum(axis=1,
+                                                     dtype=numpy.float64)
+        o_full = o_counts == k
+        full = o_full | (x_counts == k)
+        has_line = full.any(axis=1)
+        board_full = (chunk != 0).all(axis=1)
+        codes = numpy.where(board_full, 3, 0).astype(numpy.int8)
+        lines = numpy.flatnonzero(has_line)
+        if len(lines):
+            # heuristics: the first full window (in order of windows) decides,
+            first = full[lines].argmax(axis=1)
+            values[lines] = numpy.where(o_full[lines, first], numpy.inf,
+                                        -numpy.inf)
+            # winner: the first full window in order of winner decides.
+            first = order[full[lines][:, order].argmax(axis=1)]
+            codes[lines] = numpy.where(o_full[lines, first], 1, 2)
+        heuristics[start:stop] = values if ox == 'o' else -values
+        winners[start:stop] = codes
+        draws[start:stop] = (~alive).all(axis=1)
+    return BatchResult(heuristics, winners, draws)
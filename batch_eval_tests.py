@@ -0,0 +1,67 @@
+import random
+import unittest
+from tic_tac_toe import *
+
+try:
+    import numpy
+    from batch_eval import WINNERS, batch_evaluate, positions_array, \
+        window_matrix
+except ImportError:
+    numpy = None
+
+
+def random_boards(n, count, rand):
+    """Returns boards with random symbols (not necessarily reachable in the
+    game, so both players can have lines). """
+    boards = []
+    for number in range(count):
+        board = empty_board(n)
+        fields = empty_fields(board)
+        for field in rand.sample(fields, rand.randrange(len(fields) + 1)):
+            make_move(board, field, rand.choice('ox'))
+        boards.append(board)
+    return boards
+
+
+@unittest.skipUnless(numpy, 'numpy is not installed')
+class TestBatchEval(unittest.TestCase):
+
+    def test_window_matrix(self):
+        matrix = window_matrix(3, 2)
+        self.assertEqual(matrix.shape, (6, len(winning_windows(3, 2))))
+        self.assertTrue((matrix.sum(axis=0) == 2).all())
+
+    def test_positions_array(self):
+        board = empty_board(3)
+        make_move(board, (0, 2), 'o')
+        make_move(board, (2, 0), 'x')
+        self.assertEqual(positions_array([board]).tolist(),
+                         [[0, 0, 1, 0, 0, 2]])
+        self.assertEqual(positions_array([BitBoard.from_board(board)])
+                         .dtype, numpy.int8)
+
+    def test_same_as_functions(self):
+        rand = random.Random(0)
+        for n in range(1, 8):
+            boards = random_boards(n, 100, rand)
+            positions = positions_array(boards)
+            for k in range(1, n + 2):
+                for ox in 'ox':
+                    result = batch_evaluate(positions, n, k, ox, 7)
+                    for (number, board) in enumerate(boards):
+                        self.assertEqual(result.heuristics[number],
+                                         heuristics(board, k, ox))
+                        self.assertEqual(WINNERS[result.winners[number]],
+                                         winner(board, k))
+                        self.assertEqual(result.draws[number],
+                                         is_draw(board, k))
+
+    def test_invalid_shape(self):
+        with self.assertRaises(Exception):
+            batch_evaluate(numpy.zeros((3, 5), numpy.int8), 3, 3)
+        result = batch_evaluate(numpy.zeros((0, 6), numpy.int8), 3, 3)
+        self.assertEqual(len(result.heuristics), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
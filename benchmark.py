@@ -0,0 +1,182 @@
+"""Benchmarks of the engine hot paths.
+
+Functions winner, is_draw, heuristics and empty_fields are timed on a fixed
+set of positions for board sizes 3..12 and a few values of k, and
+negamax_move is run to a fixed depth with a fixed seed, so the numbers are
+repeatable. Results can be saved as JSON and compared with a baseline:
+
+    python benchmark.py --output baseline.json
+    ... change the engine ...
+    python benchmark.py --baseline baseline.json --threshold 0.2
+
+The comparison fails (exit code 1) when any time grew by more than threshold
+(20%) or when fixed-depth search visited more nodes or fewer positions than
+in the baseline.
+Option --pvs makes negamax_move use principal variation search, so both
+searches can be compared (A/B) with the same names of benchmarks:
+
+    python benchmark.py --output alpha_beta.json
+    python benchmark.py --pvs --baseline alpha_beta.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+
+from tic_tac_toe import BitBoard, SearchStats, empty_board, empty_fields, \
+    heuristics, is_draw, make_move, negamax_move, winner, winner_after
+
+
+def search_depth(n):
+    """Returns depth of the benchmark search on the board of size n."""
+    return 4 if n <= 5 else 3 if n <= 8 else 2
+
+
+def games(quick=False):
+    """Returns the list of benchmarked (n, k) pairs."""
+    sizes = (3, 5, 7) if quick else range(3, 13)
+    return [(n, k) for n in sizes for k in (3, 4, 5) if k <= n]
+
+
+def positions(n, k, count=10, seed=0):
+    """Returns count positions of the game on board of size n: each one is
+    the board after random moves (about a third of the board is filled) in
+    which nobody has won yet. Positions depend only on arguments. """
+    rand = random.Random('%i %i %i' % (n, k, seed))
+    stones = n * (n + 1) // 6
+    result = []
+    while len(result) < count:
+        board = empty_board(n)
+        for number in range(stones):
+            ox = 'ox'[number % 2]
+            move = rand.choice(empty_fields(board))
+            make_move(board, move, ox)
+            if winner_after(board, k, move, ox) is not None:
+                break
+        else:
+            result.append(board)
+    return result
+
+
+def time_function(function, boards, repeat):
+    """Returns the best time (over repeat runs) of calling function for all
+    boards, in seconds per call. Every run takes at least 10 ms. """
+    timer = timeit.Timer(lambda: [function(board) for board in boards])
+    number = 1
+    while timer.timeit(number) < 0.01:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number / len(boards)
+
+
+def benchmark_game(n, k, repeat=5, pvs=False):
+    """Returns results of benchmarks of the game on the board of size n:
+    dictionary of names of benchmarks and their results. Parameter pvs is
+    passed to negamax_move. The search is timed on the first three positions
+    which it searches to the full depth (in others it finds a forced win
+    earlier), without the threat pre-pass, and their number is stored as
+    positions. """
+    boards = positions(n, k)
+    bit_boards = [BitBoard.from_board(board) for board in boards]
+    results = {}
+    for (name, function) in (
+            ('winner', lambda board: winner(board, k)),
+            ('is_draw', lambda board: is_draw(board, k)),
+            ('heuristics', lambda board: heuristics(board, k, 'o')),
+            ('empty_fields', empty_fields)):
+        results['%s n=%i k=%i' % (name, n, k)] = \
+            {'seconds': time_function(function, boards, repeat)}
+        results['%s[bitboard] n=%i k=%i' % (name, n, k)] = \
+            {'seconds': time_function(function, bit_boards, repeat)}
+    depth = search_depth(n)
+    stats = SearchStats()
+    seconds_to_depth = []  # time to reach each depth summed over positions
+    searched = 0  # positions searched to depth
+    for board in boards:
+        if searched == 3:
+            break
+        ox = 'ox'[(n * (n + 1) // 2 - len(empty_fields(board))) % 2]
+        board_stats = SearchStats()
+        negamax_move(board, k, ox, None, seed=0, stats=board_stats,
+                     max_depth=depth, pvs=pvs, threat_search=False)
+        if board_stats.depth < depth:
+            continue  # the search found a forced win earlier
+        searched += 1
+        stats.nodes += board_stats.nodes
+        stats.seconds += board_stats.seconds
+        for iteration in board_stats.iterations:
+            if len(seconds_to_depth) < iteration.depth:
+                seconds_to_depth.append(0.0)
+            seconds_to_depth[iteration.depth - 1] += iteration.seconds
+    results['negamax depth=%i n=%i k=%i' % (depth, n, k)] = {
+        'seconds': stats.seconds, 'nodes': stats.nodes,
+        'nodes_per_second': stats.nodes_per_second,
+        'seconds_to_depth': seconds_to_depth, 'positions': searched}
+    return results
+
+
+def run(quick=False, repeat=5, pvs=False):
+    """Runs all benchmarks and returns a dictionary to be saved as JSON."""
+    results = {}
+    for (n, k) in games(quick):
+        results.update(benchmark_game(n, k, repeat, pvs))
+    return {'python': platform.python_version(),
+            'machine': platform.machine(), 'pvs': pvs, 'results': results}
+
+
+def compare(results, baseline, threshold=0.2):
+    """Returns the list of descriptions of regressions: benchmarks which are
+    slower than in baseline by more than threshold (0.2 means 20%), which
+    visited more nodes or searched fewer positions. """
+    regressions = []
+    for (name, result) in sorted(results['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        if result['seconds'] > base['seconds'] * (1 + threshold):
+            regressions.append('%s: %.3g s -> %.3g s (%+.0f%%)' % (
+                name, base['seconds'], result['seconds'],
+                100 * (result['seconds'] / base['seconds'] - 1)))
+        if result.get('nodes', 0) > base.get('nodes', result.get('nodes', 0)):
+            regressions.append('%s: %i nodes -> %i nodes' % (
+                name, base['nodes'], result['nodes']))
+        if result.get('positions', 0) < base.get('positions', 0):
+            regressions.append('%s: %i positions -> %i positions' % (
+                name, base['positions'], result.get('positions', 0)))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='only a few board sizes')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='file to save results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--pvs', action='store_true',
+                        help='principal variation search in negamax_move')
+    args = parser.parse_args()
+
+    results = run(args.quick, args.repeat, args.pvs)
+    for (name, result) in results['results'].items():
+        line = '%-36s %12.2f us' % (name, result['seconds'] * 1e6)
+        if 'nodes' in result:
+            line += ' %9i nodes %9.0f nodes/s' % (result['nodes'],
+                                                  result['nodes_per_second'])
+        print(line)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=1)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print('REGRESSION ' + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import unittest
+from tic_tac_toe import *
+from benchmark import benchmark_game, compare, positions
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_positions(self):
+        boards = positions(6, 3)
+        self.assertEqual(boards, positions(6, 3))
+        self.assertEqual(len(boards), 10)
+        for board in boards:
+            self.assertIsNone(winner(board, 3))
+            self.assertEqual(len(empty_fields(board)), 21 - 7)
+
+    def test_benchmark_game(self):
+        results = benchmark_game(4, 3, repeat=1)
+        self.assertIn('heuristics[bitboard] n=4 k=3', results)
+        search = results['negamax depth=4 n=4 k=3']
+        self.assertEqual(search['nodes'],
+                         benchmark_game(4, 3, repeat=1)
+                         ['negamax depth=4 n=4 k=3']['nodes'])
+        self.assertEqual(len(search['seconds_to_depth']), 4)
+        self.assertEqual(search['positions'], 3)
+        self.assertGreater(search['nodes'], 0)
+        pvs = benchmark_game(4, 3, repeat=1, pvs=True)
+        self.assertEqual(pvs['negamax depth=4 n=4 k=3']['positions'], 3)
+        self.assertLessEqual(pvs['negamax depth=4 n=4 k=3']['nodes'],
+                             search['nodes'])
+
+    def test_compare(self):
+        baseline = {'results': {'a': {'seconds': 1.0},
+                                'b': {'seconds': 1.0, 'nodes': 100}}}
+        results = {'results': {'a': {'seconds': 1.1},
+                               'b': {'seconds': 0.5, 'nodes': 100},
+                               'c': {'seconds': 9.0}}}
+        self.assertEqual(compare(results, baseline), [])
+        results['results']['a']['seconds'] = 1.3
+        results['results']['b']['nodes'] = 101
+        self.assertEqual(len(compare(results, baseline)), 2)
+        baseline['results']['b']['positions'] = 3
+        results['results']['b']['positions'] = 2
+        self.assertEqual(len(compare(results, baseline)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
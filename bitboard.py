@@ -0,0 +1,206 @@
+"""Compact position type for the triangular board.
+
+Every player's symbols are kept in one integer. Field (i, j) is the bit
+number i * (n + 1) + j, so each row is followed by at least one bit that
+never belongs to the board. Thanks to it shifting a bitmask along one of the
+four line directions never wraps a line from one row into another.
+
+BitBoard is a storage format with fast whole-position checks (winner,
+is_draw, heuristics). Searches convert it to the list board and evaluate
+positions incrementally with windows.Evaluator instead.
+"""
+import collections
+import functools
+import math
+
+from windows import winning_windows
+
+
+BitTables = collections.namedtuple('BitTables',
+                                   'stride shifts masks fields full')
+# stride - distance between rows (n + 1 bits),
+# shifts - bit distances for right, down, downright and downleft directions,
+# masks - masks[i][j] is the bit of field (i, j),
+# fields - list of (field, mask) pairs in row-major order,
+# full - mask of all fields of the board.
+
+
+@functools.lru_cache(maxsize=None)
+def bit_tables(n):
+    """Returns BitTables for the board of size n. The tables are computed
+    once per board size. """
+    if n < 1:
+        raise Exception("Incorrect board size.")
+    stride = n + 1
+    masks = [[1 << (i * stride + j) for j in range(n - i)] for i in range(n)]
+    fields = [((i, j), mask) for (i, row) in enumerate(masks)
+              for (j, mask) in enumerate(row)]
+    full = 0
+    for (field, mask) in fields:
+        full |= mask
+    return BitTables(stride, (1, stride, stride + 1, stride - 1), masks,
+                     fields, full)
+
+
+@functools.lru_cache(maxsize=None)
+def window_masks(n, k):
+    """Returns a tuple of masks of all windows (see winning_windows) on the
+    board of size n. """
+    masks = bit_tables(n).masks
+    result = []
+    for window in winning_windows(n, k):
+        mask = 0
+        for (i, j) in window:
+            mask |= masks[i][j]
+        result.append(mask)
+    return tuple(result)
+
+
+def has_line(bits, k, shifts):
+    """Checks if bits contain k set bits in a line in one of the directions
+    given by shifts. """
+    for shift in shifts:
+        # After the loop a bit of run is set only if there are length set
+        # bits in a line starting from it. Length grows by doubling.
+        run = bits
+        length = 1
+        while 2 * length <= k:
+            run &= run >> (shift * length)
+            length *= 2
+        if length < k:
+            run &= run >> (shift * (k - length))
+        if run:
+            return True
+    return False
+
+
+class BitBoard:
+    """Board of size n stored as two bitmasks: o and x. It supports the same
+    operations as the list board returned by empty_board, so it can be
+    passed to make_move, empty_fields, winner, is_draw, heuristics and
+    negamax_move. Searches don't run on bitboards: negamax_move converts
+    the BitBoard to the list board at the root, so bitmasks speed up only
+    evaluation of whole positions, not the search. """
+    __slots__ = ('n', 'o', 'x')
+
+    def __init__(self, n, o=0, x=0):
+        bit_tables(n)  # validates n
+        self.n = n
+        self.o = o
+        self.x = x
+
+    @classmethod
+    def from_board(cls, board):
+        """Returns BitBoard with the same content as the list board."""
+        result = cls(len(board))
+        masks = bit_tables(result.n).masks
+        for (i, row) in enumerate(board):
+            for (j, content) in enumerate(row):
+                if content == 'o':
+                    result.o |= masks[i][j]
+                elif content == 'x':
+                    result.x |= masks[i][j]
+        return result
+
+    def to_board(self):
+        """Returns the list board with the same content."""
+        return [['o' if self.o & mask else 'x' if self.x & mask else '.'
+                 for mask in row] for row in bit_tables(self.n).masks]
+
+    def __len__(self):
+        return self.n
+
+    def __eq__(self, other):
+        return isinstance(other, BitBoard) and self.n == other.n \
+            and self.o == other.o and self.x == other.x
+
+    def __hash__(self):
+        return hash((self.n, self.o, self.x))
+
+    def __repr__(self):
+        return 'BitBoard(%i, o=%#x, x=%#x)' % (self.n, self.o, self.x)
+
+    def __deepcopy__(self, memo):
+        return BitBoard(self.n, self.o, self.x)
+
+    def make_move(self, field, ox):
+        """Puts ox on the field. If ox is '.' the field is cleared."""
+        mask = bit_tables(self.n).masks[field[0]][field[1]]
+        if ox == 'o':
+            self.o |= mask
+            self.x &= ~mask
+        elif ox == 'x':
+            self.x |= mask
+            self.o &= ~mask
+        else:
+            self.o &= ~mask
+            self.x &= ~mask
+
+    def fields_with_symbol(self, s):
+        """Returns a list of fields containing symbol s in row-major
+        order. """
+        if s == 'o':
+            bits = self.o
+        elif s == 'x':
+            bits = self.x
+        else:
+            bits = bit_tables(self.n).full & ~(self.o | self.x)
+        return [field for (field, mask) in bit_tables(self.n).fields
+                if bits & mask]
+
+    def winner(self, k):
+        """Same as winner function for list boards."""
+        shifts = bit_tables(self.n).shifts
+        if has_line(self.o, k, shifts):
+            return 'o'
+        if has_line(self.x, k, shifts):
+            return 'x'
+        return None if self.o | self.x != bit_tables(self.n).full else '.'
+
+    def winner_after(self, k, move, ox, empty_count=None):
+        """Same as winner_after function for list boards."""
+        tables = bit_tables(self.n)
+        mask = tables.masks[move[0]][move[1]]
+        bits = self.o if ox == 'o' else self.x
+        for shift in tables.shifts:
+            count = 1
+            probe = mask << shift
+            while bits & probe:
+                count += 1
+                probe <<= shift
+            probe = mask >> shift
+            while bits & probe:
+                count += 1
+                probe >>= shift
+            if count >= k:
+                return ox
+        if empty_count is None:
+            empty_count = (tables.full & ~(self.o | self.x)).bit_count()
+        return None if empty_count else '.'
+
+    def is_draw(self, k):
+        """Same as is_draw function for list boards."""
+        tables = bit_tables(self.n)
+        empty = tables.full & ~(self.o | self.x)
+        return not has_line(self.o | empty, k, tables.shifts) \
+            and not has_line(self.x | empty, k, tables.shifts)
+
+    def heuristics(self, k, ox):
+        """Same as heuristics function for list boards."""
+        o, x = self.o, self.x
+        result = 0
+        for window in window_masks(self.n, k):
+            o_part = o & window
+            x_part = x & window
+            if o_part:
+                if not x_part:
+                    count = o_part.bit_count()
+                    if count == k:
+                        return math.inf if ox == 'o' else -math.inf
+                    result += count
+            elif x_part:
+                count = x_part.bit_count()
+                if count == k:
+                    return math.inf if ox == 'x' else -math.inf
+                result -= count
+        return result if ox == 'o' else -result
@@ -0,0 +1,86 @@
+import random
+import unittest
+from tic_tac_toe import *
+
+
+def random_board(rand, n, stones):
+    """Returns a list board of size n with given number of random stones."""
+    board = empty_board(n)
+    fields = empty_fields(board)
+    rand.shuffle(fields)
+    for (number, field) in enumerate(fields[:stones]):
+        make_move(board, field, 'ox'[number % 2])
+    return board
+
+
+class TestBitBoard(unittest.TestCase):
+
+    def test_conversion(self):
+        board = [['o', '.', 'x'], ['.', 'x'], ['o']]
+        bit_board = BitBoard.from_board(board)
+        self.assertEqual(bit_board.to_board(), board)
+        self.assertEqual(len(bit_board), 3)
+        self.assertEqual(BitBoard(4).to_board(), empty_board(4))
+
+    def test_make_move(self):
+        bit_board = BitBoard(5)
+        make_move(bit_board, (1, 1), 'x')
+        make_move(bit_board, (0, 4), 'o')
+        self.assertEqual(bit_board.to_board(),
+                         [['.', '.', '.', '.', 'o'], ['.', 'x', '.', '.'],
+                          ['.', '.', '.'], ['.', '.'], ['.']])
+        make_move(bit_board, (1, 1), '.')  # undo move
+        self.assertEqual(fields_with_symbol(bit_board, 'o'), [(0, 4)])
+        self.assertEqual(len(empty_fields(bit_board)), 14)
+
+    def test_same_as_list_board(self):
+        rand = random.Random(0)
+        for n in range(1, 9):
+            for _ in range(30):
+                stones = rand.randint(0, n * (n + 1) // 2)
+                board = random_board(rand, n, stones)
+                bit_board = BitBoard.from_board(board)
+                self.assertEqual(empty_fields(bit_board), empty_fields(board))
+                for k in range(1, n + 2):
+                    self.assertEqual(is_draw(bit_board, k), is_draw(board, k))
+                    if has_line(board, k, 'o') and has_line(board, k, 'x'):
+                        continue  # winner depends on the scanning order
+                    self.assertEqual(winner(bit_board, k), winner(board, k))
+                    self.assertEqual(heuristics(bit_board, k, 'o'),
+                                     heuristics(board, k, 'o'))
+                    self.assertEqual(heuristics(bit_board, k, 'x'),
+                                     heuristics(board, k, 'x'))
+
+    def test_winner_after(self):
+        rand = random.Random(1)
+        for n in range(1, 8):
+            for k in range(1, n + 2):
+                board = empty_board(n)
+                bit_board = BitBoard(n)
+                moves = empty_fields(board)
+                rand.shuffle(moves)
+                for (number, move) in enumerate(moves):
+                    ox = 'ox'[number % 2]
+                    make_move(board, move, ox)
+                    make_move(bit_board, move, ox)
+                    result = winner_after(bit_board, k, move, ox)
+                    self.assertEqual(result,
+                                     winner_after(board, k, move, ox))
+                    if result is not None:
+                        break
+
+    def test_negamax_move(self):
+        board = BitBoard.from_board([['.', '.', 'o'], ['x', 'o'], ['.']])
+        self.assertEqual(negamax_move(board, 3, 'x', 1), (2, 0))
+        self.assertEqual(board.to_board(), [['.', '.', 'o'], ['x', 'o'],
+                                            ['.']])
+
+
+def has_line(board, k, ox):
+    """Checks if ox has k symbols in a line on the board."""
+    board = [[c if c == ox else '.' for c in row] for row in board]
+    return winner(board, k) == ox
+
+
+if __name__ == '__main__':
+    unittest.main()
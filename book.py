@@ -0,0 +1,163 @@
+"""Opening book: best moves of positions from the beginning of the game.
+
+The book is built offline by searching every position reachable in a given
+number of moves (plies); positions which are transpositions of each other are
+searched once:
+
+    python book.py 7 4 --plies 2 --depth 6 --output book_7_4.bin
+
+The file is memory-mapped by OpeningBook, so all processes using the same
+book share one copy of it in the page cache:
+
+    book = OpeningBook('book_7_4.bin')
+    negamax_move(board, 4, 'o', book=book)
+
+File format (little-endian): header - magic b'TTTB', version, n and k (one
+byte each), padding byte and number of records (uint32); then records sorted
+by position: symmetry.canonical_hash (uint64) of the position and the player
+to move, and windows.field_index (uint16) of the best move in the orientation
+of the hash.
+"""
+import argparse
+import mmap
+import os
+import struct
+
+from symmetry import canonical_hash, map_move, unique_moves
+from tic_tac_toe import TranspositionTable, empty_board, empty_fields, \
+    get_opponent, is_draw, make_move, negamax_move, winner_after
+from windows import board_fields, field_index
+
+MAGIC = b'TTTB'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBxI')
+RECORD = struct.Struct('<QH')
+
+
+def book_positions(n, k, plies):
+    """Yields tuples (board, ox, key, transposed) for all positions of the
+    game on the board of size n reachable in at most plies moves in which
+    the game isn't over yet: the board, the player to move and the result of
+    canonical_hash(board, ox). Only one position of every pair of
+    transpositions is yielded. """
+    level = {0: empty_board(n)}
+    for ply in range(plies + 1):
+        ox = 'ox'[ply % 2]
+        next_level = {}
+        for board in level.values():
+            key, transposed = canonical_hash(board, ox)
+            yield board, ox, key, transposed
+            if ply == plies:
+                continue
+            for move in unique_moves(board, empty_fields(board)):
+                child = [row[:] for row in board]
+                make_move(child, move, ox)
+                if winner_after(child, k, move, ox) is not None \
+                        or is_draw(child, k):
+                    continue
+                child_key = canonical_hash(child, get_opponent(ox))[0]
+                next_level.setdefault(child_key, child)
+        level = next_level
+
+
+def build_book(n, k, plies, time_limit=None, max_depth=None, seed=0,
+               progress=None):
+    """Searches all book_positions(n, k, plies) with negamax_move (with
+    time_limit and max_depth) and returns a dictionary of canonical hashes
+    and field indexes of the best moves. If progress is given, it's called
+    as progress(board, ox, move) after every search. """
+    tt = TranspositionTable(n, k)
+    moves = {}
+    for (board, ox, key, transposed) in book_positions(n, k, plies):
+        move = negamax_move(board, k, ox, time_limit, tt, seed=seed,
+                            max_depth=max_depth)
+        moves[key] = field_index(n, map_move(move, transposed))
+        if progress is not None:
+            progress(board, ox, move)
+    return moves
+
+
+def write_book(path, n, k, moves):
+    """Writes the book of the game (n, k) with moves (dictionary of canonical
+    hashes and field indexes, as returned by build_book) to the file. """
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, n, k, len(moves)))
+        for key in sorted(moves):
+            file.write(RECORD.pack(key, moves[key]))
+
+
+class OpeningBook:
+    """Book written by write_book. The file is memory-mapped and searched
+    with binary search, so opening the book is cheap regardless of its size.
+    Attributes n and k describe the game of the book. """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            # Empty files can't be mapped.
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise Exception("Not an opening book: %s" % path)
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.n, self.k, self.count = \
+            HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION \
+                or len(self.map) != HEADER.size + self.count * RECORD.size:
+            self.map.close()
+            raise Exception("Not an opening book: %s" % path)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.map.close()
+
+    def lookup(self, board, ox):
+        """Returns the best move for ox on the board or None if the position
+        isn't in the book. """
+        if len(board) != self.n:
+            return None
+        key, transposed = canonical_hash(board, ox)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            middle_key, index = RECORD.unpack_from(
+                self.map, HEADER.size + middle * RECORD.size)
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return map_move(board_fields(self.n)[index], transposed)
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('n', type=int, help='board size')
+    parser.add_argument('k', type=int, help='number of symbols to win')
+    parser.add_argument('--plies', type=int, default=2,
+                        help='number of moves from the empty board')
+    parser.add_argument('--depth', type=int, help='search depth')
+    parser.add_argument('--time-limit', type=float,
+                        help='time limit of one search in seconds')
+    parser.add_argument('--output', required=True, help='book file')
+    args = parser.parse_args()
+    if args.depth is None and args.time_limit is None:
+        parser.error('--depth or --time-limit is required')
+
+    def progress(board, ox, move):
+        print('%s: %s' % (ox, move))
+
+    moves = build_book(args.n, args.k, args.plies, args.time_limit,
+                       args.depth, progress=progress)
+    write_book(args.output, args.n, args.k, moves)
+    print('%i positions written to %s' % (len(moves), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from tic_tac_toe import *
+from book import HEADER, MAGIC, VERSION, OpeningBook, book_positions, \
+    build_book, write_book
+from symmetry import transpose
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'book.bin')
+
+    def test_book_positions(self):
+        positions = list(book_positions(4, 3, 1))
+        self.assertEqual(positions[0][:2], (empty_board(4), 'o'))
+        # 10 fields, but only 6 moves up to transposition:
+        self.assertEqual(len(positions), 7)
+        self.assertEqual(len({key for (_, _, key, _) in positions}), 7)
+        self.assertTrue(all(ox == 'x' for (_, ox, _, _) in positions[1:]))
+
+    def test_build_and_lookup(self):
+        moves = build_book(4, 3, 2, max_depth=3)
+        write_book(self.path, 4, 3, moves)
+        with OpeningBook(self.path) as book:
+            self.assertEqual((book.n, book.k, len(book)), (4, 3, len(moves)))
+            for (board, ox, key, transposed) in book_positions(4, 3, 2):
+                move = book.lookup(board, ox)
+                self.assertEqual(board[move[0]][move[1]], '.')
+                if transpose(board) != board:
+                    self.assertEqual(book.lookup(transpose(board), ox),
+                                     (move[1], move[0]))
+                self.assertEqual(book.lookup(BitBoard.from_board(board), ox),
+                                 move)
+            board = empty_board(4)
+            for move in (0, 0), (0, 1), (0, 2):
+                make_move(board, move, 'o')
+            self.assertIsNone(book.lookup(board, 'x'))
+            self.assertIsNone(book.lookup(empty_board(5), 'o'))
+
+    def test_negamax_move_with_book(self):
+        write_book(self.path, 4, 3, {0: 7})  # the empty board -> (2, 0)
+        with OpeningBook(self.path) as book:
+            stats = SearchStats()
+            self.assertEqual(negamax_move(empty_board(4), 3, 'o', book=book,
+                                          stats=stats), (2, 0))
+            self.assertEqual((stats.move, stats.nodes), ((2, 0), 0))
+            board = empty_board(4)
+            make_move(board, (2, 0), 'o')
+            move = negamax_move(board, 3, 'x', None, max_depth=1, book=book)
+            self.assertEqual(board[move[0]][move[1]], '.')
+            with self.assertRaises(Exception):
+                negamax_move(empty_board(4), 4, 'o', book=book)
+
+    def test_invalid_file(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a book')
+        with self.assertRaises(Exception):
+            OpeningBook(self.path)
+        for size in (0, 4, 12):  # empty, truncated header, no records
+            with open(self.path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, VERSION, 3, 3, 1)[:size])
+            with self.assertRaisesRegex(Exception, 'Not an opening book'):
+                OpeningBook(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Engines: negamax_move configured once per game.
+
+An Engine is constructed once for the board size n, the number k of symbols
+in a line and settings of negamax_move, and is then called like any other
+player, so no closures are needed to change settings:
+
+    engine = Engine(7, 4, time_limit=20)
+    board, result, history = begin(engine, human_move, 7, 4)
+
+Tables derived from (n, k) - windows, bitmasks and Zobrist keys - are built
+on first use and cached by the engine, as are its transposition table and
+opening book or tablebase (given by paths of their files). Pickling drops
+all of them, so an engine is cheap to send to worker processes, which build
+only the tables they really use. Modules of optional features (parallel
+search, opening book, tablebase) and of the tables are imported only when
+they are used.
+"""
+import functools
+
+from tic_tac_toe import empty_board, negamax_move
+
+# Tables of the game built by warm:
+TABLES = ('windows', 'field_windows', 'bit_tables', 'window_masks',
+          'zobrist_keys', 'fields')
+# Attributes built on first use and dropped by pickling:
+CACHED = TABLES + ('tt', 'opening_book', 'tablebase')
+
+
+class Engine:
+    """Move chooser for games on the board of size n with k symbols in a
+    line needed to win, called as engine(board, k, ox) like negamax_move.
+    Other parameters are settings of negamax_move, except for book and
+    exact, which are paths of an opening book (book.py) and a tablebase
+    (solver.py). The transposition table of max_entries entries is kept
+    between moves unless reuse_table is False. """
+
+    def __init__(self, n, k, time_limit=10, workers=1, seed=None,
+                 max_depth=None, move_ordering=True, threat_search=True,
+                 pvs=False, book=None, exact=None, max_entries=1 << 18,
+                 reuse_table=True):
+        if n < 1 or k < 1:
+            raise Exception("Incorrect game settings.")
+        self.n = n
+        self.k = k
+        self.time_limit = time_limit
+        self.workers = workers
+        self.seed = seed
+        self.max_depth = max_depth
+        self.move_ordering = move_ordering
+        self.threat_search = threat_search
+        self.pvs = pvs
+        self.book = book
+        self.exact = exact
+        self.max_entries = max_entries
+        self.reuse_table = reuse_table
+
+    def __repr__(self):
+        return 'Engine(%s)' % ', '.join(
+            '%s=%r' % item for item in self.settings().items())
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in CACHED:
+            state.pop(name, None)
+        return state
+
+    def __call__(self, board, k, ox, time_limit=None, limits=None,
+                 stats=None):
+        """Returns the move of ox on the board. Parameter time_limit
+        overrides the time limit of the engine unless it's None; limits and
+        stats are passed to negamax_move. """
+        if len(board) != self.n or k != self.k:
+            raise Exception("Engine for different game.")
+        return negamax_move(
+            board, k, ox,
+            time_limit=self.time_limit if time_limit is None else time_limit,
+            tt=self.tt if self.reuse_table else None, workers=self.workers,
+            seed=self.seed, limits=limits, stats=stats,
+            max_depth=self.max_depth, move_ordering=self.move_ordering,
+            book=self.opening_book, exact=self.tablebase,
+            threat_search=self.threat_search, pvs=self.pvs)
+
+    def settings(self):
+        """Returns a dictionary of settings of the engine (arguments of the
+        constructor), e.g. to be stored with game records. """
+        return {name: getattr(self, name) for name in (
+            'n', 'k', 'time_limit', 'workers', 'seed', 'max_depth',
+            'move_ordering', 'threat_search', 'pvs', 'book', 'exact',
+            'max_entries', 'reuse_table')}
+
+    def warm(self):
+        """Builds all tables of the game at once (e.g. in a pool initializer)
+        and returns the engine. """
+        for name in TABLES:
+            getattr(self, name)
+        return self
+
+    def new_board(self):
+        return empty_board(self.n)
+
+    def evaluator(self, board):
+        """Returns Evaluator of the board."""
+        from windows import Evaluator
+        return Evaluator(board, self.k)
+
+    @functools.cached_property
+    def windows(self):
+        from windows import winning_windows
+        return winning_windows(self.n, self.k)
+
+    @functools.cached_property
+    def field_windows(self):
+        from windows import field_windows
+        return field_windows(self.n, self.k)
+
+    @functools.cached_property
+    def bit_tables(self):
+        from bitboard import bit_tables
+        return bit_tables(self.n)
+
+    @functools.cached_property
+    def window_masks(self):
+        from bitboard import window_masks
+        return window_masks(self.n, self.k)
+
+    @functools.cached_property
+    def zobrist_keys(self):
+        from transposition import zobrist_keys
+        return zobrist_keys(self.n)
+
+    @functools.cached_property
+    def fields(self):
+        from windows import board_fields
+        return board_fields(self.n)
+
+    @functools.cached_property
+    def tt(self):
+        from transposition import TranspositionTable
+        return TranspositionTable(self.n, self.k, self.max_entries)
+
+    @functools.cached_property
+    def opening_book(self):
+        if self.book is None:
+            return None
+        from book import OpeningBook
+        return OpeningBook(self.book)
+
+    @functools.cached_property
+    def tablebase(self):
+        if self.exact is None:
+            return None
+        from solver import Tablebase
+        return Tablebase.load(self.exact)
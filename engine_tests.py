@@ -0,0 +1,60 @@
+import pickle
+import subprocess
+import sys
+import unittest
+from tic_tac_toe import *
+from engine import Engine
+
+
+class TestEngine(unittest.TestCase):
+
+    def test_move(self):
+        engine = Engine(3, 3, time_limit=None)
+        board = [['.', '.', 'o'], ['x', 'o'], ['.']]
+        self.assertEqual(engine(board, 3, 'x'), (2, 0))
+        self.assertEqual(engine(board, 3, 'x'),
+                         negamax_move(board, 3, 'x', None))
+        self.assertRaises(Exception, engine, empty_board(4), 3, 'o')
+        self.assertRaises(Exception, engine, board, 2, 'o')
+        board, result, history = begin(Engine(4, 3, max_depth=2),
+                                       random_move, 4, 3)
+        self.assertIn(result, ('o', 'x', '.'))
+
+    def test_tables(self):
+        engine = Engine(5, 3)
+        self.assertNotIn('windows', engine.__dict__)
+        self.assertIs(engine.windows, engine.windows)
+        self.assertEqual(engine.windows, winning_windows(5, 3))
+        self.assertEqual(len(engine.fields), 15)
+        self.assertIs(engine.warm(), engine)
+        self.assertIn('zobrist_keys', engine.__dict__)
+        self.assertIsNone(engine.opening_book)
+        self.assertIsNone(engine.tablebase)
+
+    def test_pickle(self):
+        engine = Engine(6, 4, time_limit=1, pvs=True).warm()
+        engine(empty_board(6), 4, 'o', time_limit=0.1)
+        self.assertGreater(len(engine.tt), 0)
+        data = pickle.dumps(engine)
+        self.assertLess(len(data), 1000)
+        copy = pickle.loads(data)
+        self.assertEqual(copy.settings(), engine.settings())
+        self.assertNotIn('tt', copy.__dict__)
+        self.assertEqual(copy.window_masks, engine.window_masks)
+
+        self.assertEqual(set(engine.__getstate__()), set(engine.settings()))
+
+    def test_lazy_imports(self):
+        modules = ('bitboard', 'ordering', 'symmetry', 'threats',
+                   'transposition', 'windows', 'book', 'solver', 'parallel')
+        code = ('import sys, engine; print([name for name in %r '
+                'if name in sys.modules])' % (modules,))
+        output = subprocess.run([sys.executable, '-c', code],
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), '[]')
+        import tic_tac_toe
+        self.assertIs(tic_tac_toe.BitBoard, BitBoard)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Compact binary records of games.
+
+A game is stored as a header followed by one byte per move - the index of
+the field (windows.field_index), as players alternate starting with o.
+Records are appended one after another to an archive file, so writing is
+append-only and reading streams records one by one.
+
+Record format (little-endian): magic b'TTTR', version, n, k, result (0 for
+an unfinished game, 1 for o, 2 for x, 3 for a draw), number of moves (one
+byte each) and length of metadata (uint16), then metadata - UTF-8 JSON with
+engine settings and timings (e.g. think times of moves in milliseconds) -
+and moves.
+
+    with RecordWriter('games.ttt') as writer:
+        board, result, history = begin(negamax_move, random_move, n, k)
+        writer.write(n, k, history, result, {'o': 'negamax'})
+    for record in read_records('games.ttt'):
+        for (ox, move, board) in replay(record):
+            ...
+"""
+import collections
+import json
+import struct
+
+from tic_tac_toe import empty_board, make_move
+from windows import board_fields, field_index
+
+MAGIC = b'TTTR'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBBBH')
+RESULTS = (None, 'o', 'x', '.')  # results for codes in records
+MAX_N = 21  # indexes of fields must fit in one byte
+
+GameRecord = collections.namedtuple('GameRecord',
+                                    'n k result moves settings timings')
+# moves - bytes of field indexes, settings - dictionary, timings - list or
+# None.
+
+
+def history_to_bytes(n, history):
+    """Returns bytes of moves of history (list of (symbol, move) tuples as
+    returned by begin). """
+    for (number, (ox, move)) in enumerate(history):
+        if ox != 'ox'[number % 2]:
+            raise Exception("Players must alternate starting with o.")
+    return bytes(field_index(n, move) for (ox, move) in history)
+
+
+def bytes_to_history(n, moves):
+    """Returns history (list of (symbol, move) tuples) of moves bytes."""
+    fields = board_fields(n)
+    return [('ox'[number % 2], fields[index])
+            for (number, index) in enumerate(moves)]
+
+
+def encode_record(n, k, history, result=None, settings=None, timings=None):
+    """Returns the record of the game as bytes."""
+    if not 1 <= n <= MAX_N or not 1 <= k <= 255:
+        raise Exception("Incorrect game size.")
+    moves = history_to_bytes(n, history)
+    metadata = json.dumps({'settings': settings or {}, 'timings': timings},
+                          separators=(',', ':')).encode()
+    return HEADER.pack(MAGIC, VERSION, n, k, RESULTS.index(result),
+                       len(moves), len(metadata)) + metadata + moves
+
+
+def decode_record(data, offset=0):
+    """Returns a tuple (GameRecord, offset of the next record) of the record
+    at offset in data. """
+    if len(data) - offset < HEADER.size:
+        raise Exception("Truncated game record.")
+    magic, version, n, k, result, count, length = \
+        HEADER.unpack_from(data, offset)
+    if magic != MAGIC or version != VERSION:
+        raise Exception("Not a game record.")
+    start = offset + HEADER.size
+    end = start + length + count
+    if len(data) < end:
+        raise Exception("Truncated game record.")
+    metadata = json.loads(bytes(data[start:start + length]).decode())
+    return GameRecord(n, k, RESULTS[result], bytes(data[start + length:end]),
+                      metadata['settings'], metadata['timings']), end
+
+
+class RecordWriter:
+    """Appends records of games to the file."""
+
+    def __init__(self, path):
+        self.file = open(path, 'ab')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, n, k, history, result=None, settings=None, timings=None):
+        self.file.write(encode_record(n, k, history, result, settings,
+                                      timings))
+
+    def close(self):
+        self.file.close()
+
+
+def read_records(path):
+    """Yields GameRecords of the file one by one."""
+    with open(path, 'rb') as file:
+        while True:
+            header = file.read(HEADER.size)
+            if not header:
+                return
+            if len(header) < HEADER.size:
+                raise Exception("Truncated game record.")
+            count, length = HEADER.unpack(header)[5:]
+            yield decode_record(header + file.read(length + count))[0]
+
+
+def replay(record):
+    """Yields tuples (symbol, move, board) for moves of the record. The same
+    board is changed by every move, so copy it to keep it. """
+    board = empty_board(record.n)
+    fields = board_fields(record.n)
+    for (number, index) in enumerate(record.moves):
+        ox = 'ox'[number % 2]
+        move = fields[index]
+        make_move(board, move, ox)
+        yield ox, move, board
+
+
+def to_history(record):
+    """Returns history of the record as returned by begin."""
+    return bytes_to_history(record.n, record.moves)
@@ -0,0 +1,62 @@
+import os
+import random
+import tempfile
+import unittest
+from tic_tac_toe import *
+from game_record import RecordWriter, bytes_to_history, decode_record, \
+    encode_record, history_to_bytes, read_records, replay, to_history
+
+
+class TestGameRecord(unittest.TestCase):
+
+    def test_history_conversion(self):
+        history = [('o', (0, 0)), ('x', (2, 1)), ('o', (0, 3))]
+        moves = history_to_bytes(4, history)
+        self.assertEqual(moves, bytes([0, 8, 3]))
+        self.assertEqual(bytes_to_history(4, moves), history)
+        with self.assertRaises(Exception):
+            history_to_bytes(4, [('x', (0, 0))])
+
+    def test_encode_and_decode(self):
+        history = [('o', (1, 1)), ('x', (0, 0))]
+        data = encode_record(3, 3, history, None, {'o': 'human'}, [1.5, 2])
+        self.assertEqual(data[:4], b'TTTR')
+        self.assertEqual(data[-2:], bytes([4, 0]))  # one byte per move
+        record, end = decode_record(data)
+        self.assertEqual(end, len(data))
+        self.assertEqual((record.n, record.k, record.result), (3, 3, None))
+        self.assertEqual(record.settings, {'o': 'human'})
+        self.assertEqual(record.timings, [1.5, 2])
+        self.assertEqual(to_history(record), history)
+        with self.assertRaises(Exception):
+            decode_record(data[:-1])
+        with self.assertRaises(Exception):
+            decode_record(b'XXXX' + data[4:])
+
+    def test_archive(self):
+        random.seed(0)
+        games = [begin(random_move, random_move, n, 3) for n in (3, 4, 5, 6)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.ttt')
+            with RecordWriter(path) as writer:
+                for (board, result, history) in games[:2]:
+                    writer.write(len(board), 3, history, result)
+            with RecordWriter(path) as writer:  # appending
+                for (board, result, history) in games[2:]:
+                    writer.write(len(board), 3, history, result,
+                                 {'o': 'random', 'x': 'random'})
+            records = read_records(path)
+            for (board, result, history) in games:
+                record = next(records)
+                self.assertEqual((record.n, record.result),
+                                 (len(board), result))
+                self.assertEqual(to_history(record), history)
+                positions = list(replay(record))
+                self.assertEqual([(ox, move) for (ox, move, _) in positions],
+                                 history)
+                self.assertEqual(positions[-1][2], board)
+            self.assertEqual(list(records), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+"""Monte Carlo tree search (UCT) choosing moves like negamax_move.
+
+Instead of evaluating positions with heuristics, the search plays many
+random games (playouts) to the end and grows the tree of moves in the
+direction of the moves which win most often. It needs no evaluation
+function, so it works on big boards where negamax can't search deep.
+
+Playouts run on a flat list of fields (indexed as windows.board_fields) with
+counts of symbols in windows, so a playout costs only as much as updating
+the windows of the played fields. Every expanded leaf is followed by a batch
+of playouts. Guided playouts complete own lines and block opponent's lines
+when possible instead of playing at random, which makes results of playouts
+much closer to the results of reasonable play.
+
+    mcts_move(board, k, ox, time_limit=5)
+    begin(MCTSPlayer(time_limit=5), negamax_move, n, k)  # reuses the tree
+"""
+import functools
+import math
+import random
+
+from search_limits import SearchLimits, TimeOut
+from windows import board_fields, field_index, winning_windows
+
+DIGITS = {'.': 0, 'o': 1, 'x': 2}
+
+
+@functools.lru_cache(maxsize=None)
+def playout_tables(n, k):
+    """Returns a tuple (windows, cell_windows): windows of the game as tuples
+    of field indexes and, for every field index, a tuple of numbers of
+    windows containing the field. """
+    windows = tuple(tuple(field_index(n, field) for field in window)
+                    for window in winning_windows(n, k))
+    cell_windows = [[] for field in board_fields(n)]
+    for (number, window) in enumerate(windows):
+        for cell in window:
+            cell_windows[cell].append(number)
+    return windows, tuple(tuple(numbers) for numbers in cell_windows)
+
+
+class Node:
+    """Node of the search tree: position after move (field index) played by
+    player (1 for o, 2 for x). Score is the sum of results of playouts
+    through the node for player: 1 for a win and 0.5 for a draw. Result is
+    the winner (0 for a draw) if the game is over after move. """
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried',
+                 'visits', 'score', 'result')
+
+    def __init__(self, move, player, parent, untried, result=None):
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.score = 0.0
+        self.result = result
+
+
+class Search:
+    """One tree search of the game (n, k) from the position given as a list
+    of field contents (digits: 0 empty, 1 o, 2 x). """
+
+    def __init__(self, n, k, cells, rand, guided=True, batch=8,
+                 exploration=1.4):
+        self.k = k
+        self.windows, self.cell_windows = playout_tables(n, k)
+        self.cells = cells
+        self.rand = rand
+        self.guided = guided
+        self.batch = batch
+        self.exploration = exploration
+        self.counts = [None, [0] * len(self.windows), [0] * len(self.windows)]
+        for (cell, digit) in enumerate(cells):
+            if digit:
+                for window in self.cell_windows[cell]:
+                    self.counts[digit][window] += 1
+
+    def new_root(self, player):
+        """Returns the root node for player to move."""
+        untried = [cell for (cell, digit) in enumerate(self.cells)
+                   if not digit]
+        self.rand.shuffle(untried)
+        return Node(None, 3 - player, None, untried)
+
+    def play(self, cells, counts, cell, player):
+        """Plays the move and returns True if it wins."""
+        cells[cell] = player
+        mine, other = counts[player], counts[3 - player]
+        won = False
+        for window in self.cell_windows[cell]:
+            mine[window] += 1
+            if mine[window] == self.k and other[window] == 0:
+                won = True
+        return won
+
+    def iterate(self, root, limits):
+        """Selects a leaf, expands it, runs a batch of playouts from it and
+        updates the nodes on the path. """
+        cells = self.cells[:]
+        counts = [None, self.counts[1][:], self.counts[2][:]]
+        node = root
+        # Selection:
+        while not node.untried and node.children and node.result is None:
+            log_visits = math.log(node.visits)
+            exploration = self.exploration
+            node = max(node.children, key=lambda child: child.score
+                       / child.visits + exploration
+                       * math.sqrt(log_visits / child.visits))
+            self.play(cells, counts, node.move, node.player)
+        # Expansion:
+        if node.untried and node.result is None:
+            move = node.untried.pop()
+            player = 3 - node.player
+            won = self.play(cells, counts, move, player)
+            untried = node.untried + [other.move for other in node.children]
+            self.rand.shuffle(untried)
+            child = Node(move, player, node, untried,
+                         player if won else None if untried else 0)
+            node.children.append(child)
+            node = child
+        # Simulation:
+        if node.result is not None:
+            results = [node.result] * self.batch
+        else:
+            threats = self.threats(counts) if self.guided else None
+            results = [self.playout(cells, counts, 3 - node.player, threats)
+                       for playout in range(self.batch)]
+        limits.nodes += len(results)
+        # Backpropagation:
+        wins = {0: results.count(0) * 0.5, 1: results.count(1),
+                2: results.count(2)}
+        while node is not None:
+            node.visits += len(results)
+            node.score += wins[node.player] + wins[0]
+            node = node.parent
+
+    def threats(self, counts):
+        """Returns a list of lists of windows in which o (index 1) and x
+        (index 2) miss only one symbol. """
+        k_1 = self.k - 1
+        return [None] + [[window for (window, count) in enumerate(mine)
+                          if count == k_1 and other[window] == 0]
+                         for (mine, other) in ((counts[1], counts[2]),
+                                               (counts[2], counts[1]))]
+
+    def threat_cell(self, threats, other, cells):
+        """Returns an empty field completing one of threats (windows missing
+        one symbol) which wasn't blocked by the other player or None."""
+        for window in threats:
+            if other[window] == 0:
+                for cell in self.windows[window]:
+                    if not cells[cell]:
+                        return cell
+        return None
+
+    def playout(self, cells, counts, player, threats=None):
+        """Plays the game to the end from the position and returns the
+        winner (0 for a draw). Cells and counts aren't changed. Threats (as
+        returned by self.threats) are needed by guided playouts. """
+        cells = cells[:]
+        counts = [None, counts[1][:], counts[2][:]]
+        order = [cell for (cell, digit) in enumerate(cells) if not digit]
+        self.rand.shuffle(order)
+        k = self.k
+        cell_windows = self.cell_windows
+        guided = self.guided
+        if guided:
+            threats = [None, threats[1][:], threats[2][:]]
+        while True:
+            cell = None
+            if guided:
+                # Complete own line or block opponent's line:
+                cell = self.threat_cell(threats[player], counts[3 - player],
+                                        cells)
+                if cell is None:
+                    cell = self.threat_cell(threats[3 - player],
+                                            counts[player], cells)
+            if cell is None:
+                while order and cells[order[-1]]:
+                    order.pop()
+                if not order:
+                    return 0
+                cell = order.pop()
+            cells[cell] = player
+            mine, other = counts[player], counts[3 - player]
+            for window in cell_windows[cell]:
+                count = mine[window] + 1
+                mine[window] = count
+                if other[window] == 0:
+                    if count == k:
+                        return player
+                    if guided and count == k - 1:
+                        threats[player].append(window)
+            player = 3 - player
+
+
+def board_cells(board):
+    """Returns the list of digits of fields of the board (list or
+    BitBoard). """
+    if not isinstance(board, list):
+        board = board.to_board()  # BitBoard
+    return [DIGITS[board[i][j]] for (i, j) in board_fields(len(board))]
+
+
+def mcts_move(board, k, ox, time_limit=10, playouts=None, seed=None,
+              guided=True, batch=8, exploration=1.4, limits=None):
+    """Returns the move chosen by Monte Carlo tree search in given time limit
+    (None means no limit) or after given number of playouts. Instead of them
+    SearchLimits can be given as limits (max_nodes limits playouts). Pass
+    seed to make the search repeatable (with playouts limit). """
+    return MCTSPlayer(time_limit, playouts, seed, guided, batch,
+                      exploration)(board, k, ox, limits)
+
+
+class MCTSPlayer:
+    """Move chooser (called as player(board, k, ox) like negamax_move) which
+    keeps the search tree between moves of one game: the subtree of the
+    opponent's reply becomes the root of the next search. """
+
+    def __init__(self, time_limit=10, playouts=None, seed=None, guided=True,
+                 batch=8, exploration=1.4):
+        self.time_limit = time_limit
+        self.playouts = playouts
+        self.rand = random.Random(seed) if seed is not None else random
+        self.guided = guided
+        self.batch = batch
+        self.exploration = exploration
+        self.root = None  # node of the last chosen move
+        self.cells = None  # position after the last chosen move
+        self.game = None  # (n, k) of the last search
+
+    def reused_root(self, cells, game):
+        """Returns the node of the position if it's the child of the last
+        chosen move in the kept tree or None otherwise. """
+        if self.root is None or self.game != game \
+                or len(cells) != len(self.cells):
+            return None
+        changed = [cell for (cell, digit) in enumerate(cells)
+                   if digit != self.cells[cell]]
+        if len(changed) != 1 or self.cells[changed[0]]:
+            return None
+        for child in self.root.children:
+            if child.move == changed[0]:
+                child.parent = None
+                return child
+        return None
+
+    def __call__(self, board, k, ox, limits=None):
+        n = len(board)
+        cells = board_cells(board)
+        if limits is None:
+            if self.time_limit is None and self.playouts is None:
+                raise Exception("Time limit or number of playouts needed.")
+            limits = SearchLimits(self.time_limit, self.playouts)
+        search = Search(n, k, cells, self.rand, self.guided, self.batch,
+                        self.exploration)
+        root = self.reused_root(cells, (n, k))
+        if root is None:
+            root = search.new_root(DIGITS[ox])
+        try:
+            while not (root.children
+                       and root.children[-1].result == DIGITS[ox]):
+                # (until a winning move is found)
+                search.iterate(root, limits)
+                if limits.nodes >= limits.next_check:
+                    limits.check()
+        except TimeOut:
+            pass
+        if not root.children:
+            search.iterate(root, SearchLimits())  # at least one move
+        best = max(root.children, key=lambda child: (
+            child.result == DIGITS[ox], child.visits))
+        self.root, self.game = best, (n, k)
+        self.cells = cells[:]
+        self.cells[best.move] = DIGITS[ox]
+        return board_fields(n)[best.move]
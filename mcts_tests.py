@@ -0,0 +1,73 @@
+import random
+import unittest
+from tic_tac_toe import *
+from mcts import MCTSPlayer, Search, board_cells, mcts_move, playout_tables
+from windows import board_fields
+
+
+class TestMCTS(unittest.TestCase):
+
+    def test_playout_tables(self):
+        windows, cell_windows = playout_tables(3, 2)
+        self.assertEqual(len(windows), len(winning_windows(3, 2)))
+        self.assertEqual(windows[0], (0, 1))  # (0, 0) - (0, 1)
+        self.assertEqual(len(cell_windows), 6)
+        for (cell, numbers) in enumerate(cell_windows):
+            for number in numbers:
+                self.assertIn(cell, windows[number])
+
+    def test_playout(self):
+        for guided in True, False:
+            board = empty_board(5)
+            for (move, ox) in ((0, 0), 'o'), ((4, 0), 'x'), ((0, 1), 'o'):
+                make_move(board, move, ox)
+            cells = board_cells(board)
+            search = Search(5, 3, cells, random.Random(0), guided)
+            threats = search.threats(search.counts)
+            self.assertEqual(threats[1], [0])  # the window (0, 0) - (0, 2)
+            results = [search.playout(cells, search.counts, 2, threats)
+                       for playout in range(50)]
+            self.assertEqual(cells, board_cells(board))
+            self.assertTrue(set(results) <= {0, 1, 2})
+            if guided:
+                # x blocks and o can't win immediately:
+                self.assertLess(results.count(1), 50)
+
+    def test_mcts_move(self):
+        board = empty_board(5)
+        for (move, ox) in ((0, 0), 'o'), ((4, 0), 'x'), ((0, 1), 'o'), \
+                ((2, 2), 'x'), ((0, 2), 'o'):
+            make_move(board, move, ox)
+        self.assertEqual(mcts_move(board, 4, 'x', None, 2000, seed=0),
+                         (0, 3))  # block
+        make_move(board, (3, 0), 'x')
+        self.assertEqual(mcts_move(BitBoard.from_board(board), 4, 'o', None,
+                                   2000, seed=0), (0, 3))  # win
+        with self.assertRaises(Exception):
+            mcts_move(board, 4, 'o', None)
+
+    def test_tree_reuse(self):
+        player = MCTSPlayer(None, 500, seed=0)
+        board = empty_board(5)
+        move = player(board, 4, 'o')
+        make_move(board, move, 'o')
+        reply = board_fields(5)[player.root.children[0].move]
+        make_move(board, reply, 'x')
+        root = player.reused_root(board_cells(board), (5, 4))
+        self.assertIsNotNone(root)
+        self.assertGreater(root.visits, 0)
+        self.assertIsNone(root.parent)
+        move = player(board, 4, 'o')
+        self.assertEqual(board[move[0]][move[1]], '.')
+        # Unrelated position:
+        self.assertIsNone(player.reused_root(board_cells(empty_board(5)),
+                                             (5, 4)))
+
+    def test_game(self):
+        board, result, history = begin(MCTSPlayer(None, 200, seed=1),
+                                       random_move, 4, 3)
+        self.assertIn(result, 'ox.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Move ordering for negamax.
+
+Alpha-beta cuts off the most when the best move is searched first. Moves are
+ordered as follows:
+1. the best move remembered in the transposition table (the principal
+   variation move from the previous iteration),
+2. moves completing a line,
+3. moves blocking opponent's line,
+4. killer moves - moves which recently caused a cutoff in another position
+   with the same number of symbols on the board,
+5. other moves: fields adjacent to symbols before isolated ones, each group
+   sorted by history heuristic - how often the move caused cutoffs.
+"""
+
+ADJACENT_BONUS = 1 << 40  # bigger than any history score
+
+
+class MoveOrdering:
+    """Killer moves and history heuristic of one search on the board of size
+    n. It is kept between iterations of iterative deepening. """
+
+    def __init__(self, n):
+        self.killers = {}  # number of empty fields -> list of 2 moves
+        self.history = [[0] * (n - i) for i in range(n)]
+
+    def order(self, moves, ox, evaluator=None, tt_move=None):
+        """Returns moves (all empty fields) in the order in which they should
+        be searched. Evaluator (of the current position) is used to find
+        lines to complete or block and symbols adjacent to fields. """
+        first = []
+        if tt_move is not None:
+            first.append(tt_move)
+        if evaluator is not None and evaluator.k > 1:
+            opponent = 'x' if ox == 'o' else 'o'
+            for move in evaluator.threat_fields(ox) \
+                    + evaluator.threat_fields(opponent):
+                if move not in first:
+                    first.append(move)
+        for move in self.killers.get(len(moves), ()):
+            if move not in first and move in moves:
+                first.append(move)
+        rest = [move for move in moves if move not in first]
+        history = self.history
+        if evaluator is not None:
+            adjacent = evaluator.adjacent
+            rest.sort(key=lambda move: history[move[0]][move[1]] + (
+                ADJACENT_BONUS if adjacent[move[0]][move[1]] else 0),
+                reverse=True)
+        else:
+            rest.sort(key=lambda move: history[move[0]][move[1]],
+                      reverse=True)
+        return first + rest
+
+    def cutoff(self, move, empty_count, depth):
+        """Remembers that move caused a cutoff at depth in a position with
+        empty_count empty fields. """
+        self.history[move[0]][move[1]] += depth * depth
+        killers = self.killers.setdefault(empty_count, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
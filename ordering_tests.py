@@ -0,0 +1,56 @@
+import math
+import unittest
+from tic_tac_toe import *
+
+
+class TestMoveOrdering(unittest.TestCase):
+
+    def test_order(self):
+        board = [['o', 'o', '.', '.', '.'], ['x', '.', '.', '.'],
+                 ['x', '.', '.'], ['.', '.'], ['.']]
+        evaluator = Evaluator(board, 3)
+        ordering = MoveOrdering(5)
+        moves = empty_fields(board)
+        # Win first, then block, then fields adjacent to symbols:
+        ordered = ordering.order(moves, 'o', evaluator)
+        self.assertEqual(ordered[:2], [(0, 2), (3, 0)])
+        self.assertEqual(sorted(ordered), sorted(moves))
+        self.assertTrue(all(evaluator.adjacent[i][j] for (i, j)
+                            in ordered[:-5]))
+        self.assertFalse(any(evaluator.adjacent[i][j] for (i, j)
+                             in ordered[-5:]))
+        # The move from transposition table and killers:
+        ordering.cutoff((4, 0), len(moves), 3)
+        ordered = ordering.order(moves, 'o', evaluator, (1, 3))
+        self.assertEqual(ordered[:4], [(1, 3), (0, 2), (3, 0), (4, 0)])
+        # History heuristic without evaluator:
+        ordering.killers.clear()
+        ordering.cutoff((2, 2), 1, 2)
+        self.assertEqual(ordering.order(moves, 'x')[:2], [(4, 0), (2, 2)])
+
+    def test_negamax_values(self):
+        board = [['.', 'x', 'o', '.', '.', '.'], ['.', 'x', '.', 'o', '.'],
+                 ['.', 'x', '.', 'o'], ['o', '.', '.'], ['.', '.'], ['.']]
+        for depth in range(5):
+            self.assertEqual(
+                negamax(board, 4, 'o', depth, -math.inf, math.inf,
+                        SearchLimits(), evaluator=Evaluator(board, 4)),
+                negamax(board, 4, 'o', depth, -math.inf, math.inf,
+                        SearchLimits(), evaluator=Evaluator(board, 4),
+                        ordering=MoveOrdering(6)))
+
+    def test_fewer_nodes(self):
+        board = [['.', '.', '.', '.', '.', '.', '.'],
+                 ['.', '.', 'x', '.', '.', '.'], ['.', 'o', 'o', '.', '.'],
+                 ['.', 'x', '.', '.'], ['.', '.', '.'], ['.', '.'], ['.']]
+        nodes = []
+        for move_ordering in (False, True):
+            stats = SearchStats()
+            negamax_move(board, 4, 'x', None, seed=0, stats=stats,
+                         max_depth=4, move_ordering=move_ordering)
+            nodes.append(stats.nodes)
+        self.assertLess(nodes[1], nodes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
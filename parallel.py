@@ -0,0 +1,136 @@
+"""Root-parallel negamax. Moves at the root of the game tree are divided
+between worker processes, which search them with the same negamax as
+negamax_move. Iterative deepening and dropping of losing moves happen in the
+main process, which waits for all workers after every depth.
+
+Pools are kept in this module, so starting processes is paid only by the
+first move using a given number of workers.
+"""
+import concurrent.futures
+import copy
+import math
+import os
+import random
+import time
+
+from tic_tac_toe import SearchLimits, TimeOut, TranspositionTable, \
+    Evaluator, MoveOrdering, empty_fields, get_opponent, make_move, negamax, \
+    unique_moves, zobrist_hash
+
+
+_pools = {}  # number of workers -> ProcessPoolExecutor
+_tables = {}  # (n, k) -> TranspositionTable of the worker process
+
+
+def get_pool(workers=None):
+    """Returns a process pool with given number of workers (by default one
+    per CPU). The pool is created on first use and then reused. """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pool = _pools.get(workers)
+    if pool is None:
+        pool = _pools[workers] = \
+            concurrent.futures.ProcessPoolExecutor(workers)
+    return pool
+
+
+def shutdown_pools():
+    """Stops worker processes of all pools created by get_pool."""
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
+
+
+def search_moves(board, k, ox, moves, depth, start_time, time_limit,
+                 reuse_table=True, pvs=False):
+    """Searches ox's moves to given depth in the same way as negamax_move
+    does in one iteration and returns the list of their values. It is run in
+    a worker process. Returns None if the time limit was exceeded. Worker
+    keeps its transposition table between calls if reuse_table is True.
+    Parameter start_time is taken from time.time, because the clock has to be
+    common for processes. Time limit None means no limit. Parameter pvs is
+    passed to negamax. """
+    limits = SearchLimits(None if time_limit is None
+                          else time_limit - (time.time() - start_time))
+    n = len(board)
+    tt = _tables.get((n, k)) if reuse_table else None
+    if tt is None:
+        tt = TranspositionTable(n, k)
+        if reuse_table:
+            _tables[(n, k)] = tt
+    tt.new_search()
+    opponent = get_opponent(ox)
+    keys = tt.keys.fields[ox]
+    opponent_key = zobrist_hash(board, opponent)
+    evaluator = Evaluator(board, k)
+    ordering = MoveOrdering(n)
+    empty_count = len(empty_fields(board))
+    values = []
+    best_val = -math.inf
+    try:
+        for move in moves:
+            make_move(board, move, ox)
+            evaluator.play(move, ox)
+            value = -negamax(board, k, opponent, depth - 1, -math.inf,
+                             -best_val, limits, move, empty_count - 1, tt,
+                             opponent_key ^ keys[move[0]][move[1]],
+                             evaluator, ordering=ordering, pvs=pvs)
+            make_move(board, move, '.')  # undo move
+            evaluator.undo(move, ox)
+            values.append(value)
+            if value == math.inf:
+                break  # winning move, the rest doesn't matter
+            if value > best_val:
+                best_val = value
+    except TimeOut:
+        return None
+    return values
+
+
+def parallel_negamax_move(board, k, ox, time_limit=10, workers=None,
+                          seed=None, pool=None, max_depth=None, pvs=False):
+    """Same as negamax_move, but root moves are searched in parallel by
+    workers processes of pool (by default get_pool(workers)). Time limit
+    None means no limit. Search stops at max_depth (None means the end of
+    the game) and pvs is used by workers as in negamax. When seed is
+    given, moves are shuffled with it and workers don't share transposition
+    tables between searches, so the result depends only on the position and
+    on the depth reached in time_limit. """
+    start_time = time.time()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if pool is None:
+        pool = get_pool(workers)
+    board = copy.deepcopy(board) if isinstance(board, list) \
+        else board.to_board()
+    moves = empty_fields(board)
+    moves_vals = [[move, None] for move in unique_moves(board, moves)]
+    (random.Random(seed) if seed is not None else random).shuffle(moves_vals)
+    if max_depth is None or max_depth > len(moves):
+        max_depth = len(moves)
+    for depth in range(1, 1 + max_depth):
+        best_move = moves_vals[0][0]
+        # Moves are dealt like cards, so every worker gets some of the moves
+        # which were the best in the previous iteration.
+        parts = [moves_vals[i::workers] for i in range(workers)]
+        parts = [part for part in parts if part]
+        futures = [pool.submit(search_moves, board, k, ox,
+                               [move for (move, _) in part], depth,
+                               start_time, time_limit, seed is None, pvs)
+                   for part in parts]
+        results = [future.result() for future in futures]
+        if None in results:
+            return best_move  # time elapsed during this iteration
+        for (part, values) in zip(parts, results):
+            for (move_and_val, value) in zip(part, values):
+                move_and_val[1] = value
+        winning = [move for (move, value) in moves_vals if value == math.inf]
+        if winning:
+            return winning[0]
+        moves_vals.sort(key=lambda x: x[1], reverse=True)
+        if moves_vals[0][1] == -math.inf:
+            return moves_vals[0][0]
+        moves_vals = [mv for mv in moves_vals if mv[1] > -math.inf]
+        if len(moves_vals) == 1:
+            return moves_vals[0][0]
+    return moves_vals[0][0]
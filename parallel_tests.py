@@ -0,0 +1,52 @@
+import unittest
+from tic_tac_toe import *
+from parallel import get_pool, parallel_negamax_move
+
+
+class TestParallel(unittest.TestCase):
+    # Can be time consuming due to lime limits of negamax
+
+    def test_get_pool(self):
+        self.assertIs(get_pool(2), get_pool(2))
+
+    def test_negamax_move(self):
+        # Block opponent's winning move:
+        board = [['.', '.', 'o'], ['x', 'o'], ['.']]
+        self.assertEqual(negamax_move(board, 3, 'x', 1, workers=2), (2, 0))
+        board[0][0] = 'x'
+        # Play winning moves:
+        self.assertEqual(negamax_move(board, 3, 'x', 1, workers=2), (2, 0))
+        self.assertEqual(negamax_move(board, 3, 'o', 1, workers=2), (2, 0))
+        board = [['.', 'x', 'o', '.', '.', '.'], ['.', 'x', 'x', 'o', '.'],
+                 ['.', 'x', 'x', 'o'], ['o', '.', 'o'], ['.', '.'], ['.']]
+        self.assertEqual(negamax_move(board, 4, 'o', 1, workers=2), (3, 1))
+        self.assertEqual(negamax_move(BitBoard.from_board(board), 4, 'o', 1,
+                                      workers=2), (3, 1))
+
+    def test_seed(self):
+        # The whole game tree is searched, so the result can't depend on
+        # the time needed by workers.
+        board = empty_board(4)
+        make_move(board, (1, 1), 'o')
+        for seed in range(3):
+            self.assertEqual(parallel_negamax_move(board, 3, 'x', 5, 2, seed),
+                             parallel_negamax_move(board, 3, 'x', 5, 2, seed))
+        self.assertEqual(board[1][1], 'o')
+
+    def test_settings(self):
+        board = empty_board(5)
+        make_move(board, (0, 0), 'o')
+        move = negamax_move(board, 3, 'x', None, workers=2, seed=0,
+                            max_depth=2)
+        self.assertEqual(board[move[0]][move[1]], '.')
+        move = negamax_move(board, 3, 'x', None, workers=2, seed=0,
+                            max_depth=2, pvs=True)
+        self.assertEqual(board[move[0]][move[1]], '.')
+        self.assertRaises(Exception, negamax_move, board, 3, 'x', workers=2,
+                          limits=SearchLimits(1))
+        self.assertRaises(Exception, negamax_move, board, 3, 'x', workers=2,
+                          stats=SearchStats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Pondering: searching on the opponent's time.
+
+PonderingPlayer chooses moves with negamax_move like any other player, but
+after its move it keeps searching in a background thread while the opponent
+thinks: it searches the positions after likely replies of the opponent (the
+expected reply from the principal variation first, then threats and fields
+adjacent to symbols) and remembers the best answer to every searched reply.
+When the opponent plays one of them, the answer is returned immediately (or,
+if instant is False, the search starts with the transposition table warmed
+up by pondering, which is shared by all searches of the player). Only
+searches which weren't cancelled are remembered, and answers are played
+immediately only if pondering had at least as much time as the normal
+search (ponder_limit not smaller than time_limit); otherwise they just warm
+up the table.
+
+The background thread is stopped (with SearchLimits cancel_event) as soon as
+the player is asked for a move, so searches never run in parallel. Pondering
+competes for the CPU only with the opponent, which suits human opponents,
+e.g. begin(PonderingPlayer(), human_move, n, k).
+"""
+import random
+import threading
+
+from tic_tac_toe import Evaluator, MoveOrdering, SearchLimits, SearchStats, \
+    TranspositionTable, empty_fields, get_opponent, is_draw, make_move, \
+    negamax_move, winner_after, zobrist_hash
+
+
+class PonderingPlayer:
+    """Move chooser (called as player(board, k, ox) like negamax_move) which
+    searches time_limit seconds per move and ponders at most ponder_limit
+    seconds per opponent's reply and at most max_replies replies (None means
+    all). """
+
+    def __init__(self, time_limit=10, ponder_limit=None, max_replies=None,
+                 instant=True, seed=None):
+        self.time_limit = time_limit
+        self.ponder_limit = time_limit if ponder_limit is None \
+            else ponder_limit
+        self.max_replies = max_replies
+        self.instant = instant
+        # Answers are as good as normal searches:
+        self.full_ponder = self.ponder_limit is None or (
+            time_limit is not None and self.ponder_limit >= time_limit)
+        self.rand = random.Random(seed)
+        self.tt = None
+        self.board = None  # position after the last move of the player
+        self.answers = {}  # opponent's reply -> (best answer, depth)
+        self.hits = 0  # number of opponent's replies found in answers
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def __call__(self, board, k, ox):
+        self.stop()
+        if not isinstance(board, list):
+            board = board.to_board()  # BitBoard
+        n = len(board)
+        if self.tt is None or (self.tt.n, self.tt.k) != (n, k):
+            self.tt = TranspositionTable(n, k)
+            self.answers = {}
+        reply = self.reply(board)
+        answer = self.answers.get(reply) if reply is not None else None
+        if answer is not None:
+            self.hits += 1
+        if answer is not None and self.instant and self.full_ponder:
+            move = answer[0]
+        else:
+            move = negamax_move(board, k, ox, self.time_limit, self.tt,
+                                seed=self.rand.random())
+        self.start(board, k, ox, move)
+        return move
+
+    def reply(self, board):
+        """Returns the opponent's move played after the last move of the
+        player or None if the board isn't such a position. """
+        if self.board is None or len(board) != len(self.board):
+            return None
+        changed = [(i, j) for (i, row) in enumerate(board)
+                   for (j, content) in enumerate(row)
+                   if content != self.board[i][j]]
+        if len(changed) != 1 or self.board[changed[0][0]][changed[0][1]] \
+                != '.':
+            return None
+        return changed[0]
+
+    def start(self, board, k, ox, move):
+        """Starts pondering of the position after ox played move."""
+        after = [row[:] for row in board]
+        make_move(after, move, ox)
+        self.board = after
+        self.answers = {}
+        if winner_after(after, k, move, ox) is not None or is_draw(after, k):
+            return
+        opponent = get_opponent(ox)
+        evaluator = Evaluator(after, k)
+        replies = MoveOrdering(len(after)).order(
+            empty_fields(after), opponent, evaluator,
+            self.expected_reply(after, opponent))
+        if self.max_replies is not None:
+            replies = replies[:self.max_replies]
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.ponder,
+                                       args=(after, k, ox, replies,
+                                             self.stop_event),
+                                       daemon=True)
+        self.thread.start()
+
+    def expected_reply(self, board, opponent):
+        """Returns the opponent's reply expected by the last search (the
+        move remembered in the transposition table) or None. """
+        pv = self.tt.principal_variation(zobrist_hash(board, opponent),
+                                         opponent, 1)
+        if pv and board[pv[0][0]][pv[0][1]] == '.':
+            return pv[0]
+        return None
+
+    def ponder(self, board, k, ox, replies, stop_event):
+        opponent = get_opponent(ox)
+        for reply in replies:
+            if stop_event.is_set():
+                return
+            child = [row[:] for row in board]
+            make_move(child, reply, opponent)
+            if winner_after(child, k, reply, opponent) is not None \
+                    or is_draw(child, k):
+                continue
+            stats = SearchStats()
+            limits = SearchLimits(self.ponder_limit, cancel_event=stop_event)
+            move = negamax_move(child, k, ox, tt=self.tt, limits=limits,
+                                seed=self.rand.random(), stats=stats)
+            if stop_event.is_set():
+                return  # the search was cancelled, so the move is a guess
+            # At least one iteration was completed or the move was chosen
+            # before the search (e.g. a forced win):
+            if stats.depth or stats.source != 'search':
+                self.answers[reply] = move, stats.depth
+
+    def wait(self):
+        """Waits until pondering of all replies ends."""
+        if self.thread is not None:
+            self.thread.join()
+
+    def stop(self):
+        """Stops pondering."""
+        self.stop_event.set()
+        self.wait()
+        self.thread = None
@@ -0,0 +1,80 @@
+import time
+import unittest
+from tic_tac_toe import *
+from ponder import PonderingPlayer
+
+
+class TestPonderingPlayer(unittest.TestCase):
+
+    def test_answers_from_pondering(self):
+        player = PonderingPlayer(time_limit=0.1, max_replies=3, seed=0)
+        self.addCleanup(player.stop)
+        board = empty_board(5)
+        move = player(board, 4, 'o')
+        make_move(board, move, 'o')
+        player.wait()
+        self.assertEqual(len(player.answers), 3)
+        reply = next(iter(player.answers))
+        expected = player.answers[reply][0]
+        make_move(board, reply, 'x')
+        start = time.perf_counter()
+        answer = player(board, 4, 'o')
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertEqual(answer, expected)
+        self.assertEqual(player.hits, 1)
+        self.assertEqual(board[answer[0]][answer[1]], '.')
+
+    def test_short_pondering(self):
+        # Answers of shorter searches only warm up the transposition table:
+        player = PonderingPlayer(time_limit=0.2, ponder_limit=0.05,
+                                 max_replies=1, seed=0)
+        self.addCleanup(player.stop)
+        board = empty_board(6)
+        make_move(board, player(board, 4, 'o'), 'o')
+        player.wait()
+        reply = next(iter(player.answers))
+        make_move(board, reply, 'x')
+        start = time.perf_counter()
+        player(board, 4, 'o')
+        self.assertGreater(time.perf_counter() - start, 0.1)
+        self.assertEqual(player.hits, 1)
+
+    def test_cancelled_pondering(self):
+        player = PonderingPlayer(time_limit=0.05, ponder_limit=10,
+                                 max_replies=1, seed=0)
+        board = empty_board(7)
+        player(board, 4, 'o')
+        time.sleep(0.05)
+        player.stop()
+        self.assertEqual(player.answers, {})
+
+    def test_unexpected_position(self):
+        player = PonderingPlayer(time_limit=0.1, ponder_limit=0.05,
+                                 max_replies=1, seed=0)
+        self.addCleanup(player.stop)
+        board = empty_board(4)
+        make_move(board, player(board, 3, 'o'), 'o')
+        player.wait()
+        self.assertIsNone(player.reply(empty_board(4)))
+        move = player(BitBoard.from_board(empty_board(4)), 3, 'x')
+        self.assertEqual(player.hits, 0)
+        self.assertIn(move, empty_fields(empty_board(4)))
+
+    def test_stop(self):
+        player = PonderingPlayer(time_limit=0.1, ponder_limit=None, seed=0)
+        board = empty_board(6)
+        player(board, 4, 'o')
+        start = time.perf_counter()
+        player.stop()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIsNone(player.thread)
+
+    def test_game(self):
+        player = PonderingPlayer(time_limit=0.05, ponder_limit=0.02, seed=1)
+        self.addCleanup(player.stop)
+        board, result, history = begin(random_move, player, 4, 3)
+        self.assertIn(result, 'ox.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Limits of the search: time, number of nodes and cancellation."""
+import time
+
+
+class TimeOut(Exception):
+    pass
+
+
+class SearchLimits:
+    """Decides when the search has to stop: after time_limit seconds, after
+    visiting max_nodes nodes, or when it's cancelled - by calling cancel
+    (e.g. from another thread or asyncio task) or by setting cancel_event
+    (any object with is_set method like threading.Event).
+
+    The search increases nodes at every node and calls check when nodes
+    reach next_check. Reading the clock at every node would cost almost as
+    much as the node itself, so check sets next_check according to the
+    measured speed of the search to read the clock about every resolution
+    seconds. """
+
+    def __init__(self, time_limit=None, max_nodes=None, cancel_event=None,
+                 resolution=0.002):
+        self.start_ns = time.monotonic_ns()
+        self.deadline_ns = None if time_limit is None \
+            else self.start_ns + int(time_limit * 1e9)
+        self.max_nodes = max_nodes
+        self.cancel_event = cancel_event
+        self.cancelled = False
+        self.resolution_ns = int(resolution * 1e9)
+        self.nodes = 0
+        self.interval = 16  # nodes between checks
+        self.next_check = self.interval if max_nodes is None \
+            else min(self.interval, max_nodes)
+        self.checked_ns = self.start_ns  # time of the last check
+        self.checked_nodes = 0  # nodes at the last check
+
+    def cancel(self):
+        """Makes the search stop at the nearest check."""
+        self.cancelled = True
+
+    def elapsed(self):
+        """Returns time in seconds since limits were created."""
+        return (time.monotonic_ns() - self.start_ns) / 1e9
+
+    def check(self):
+        """Raises TimeOut if one of the limits is exceeded and otherwise sets
+        next_check. """
+        if self.cancelled or (self.cancel_event is not None
+                              and self.cancel_event.is_set()):
+            raise TimeOut
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise TimeOut
+        now = time.monotonic_ns()
+        if self.deadline_ns is not None and now >= self.deadline_ns:
+            raise TimeOut
+        elapsed = now - self.checked_ns
+        if elapsed > 0:
+            # Number of nodes visited in resolution at the current speed, but
+            # the interval can at most double, because speed changes.
+            interval = (self.nodes - self.checked_nodes) \
+                * self.resolution_ns // elapsed
+            self.interval = max(1, min(interval, 2 * self.interval))
+        else:
+            self.interval *= 2
+        self.checked_ns = now
+        self.checked_nodes = self.nodes
+        self.next_check = self.nodes + self.interval
+        if self.max_nodes is not None:
+            self.next_check = min(self.next_check, self.max_nodes)
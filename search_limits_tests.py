@@ -0,0 +1,44 @@
+import threading
+import time
+import unittest
+from tic_tac_toe import *
+
+
+class TestSearchLimits(unittest.TestCase):
+
+    def test_max_nodes(self):
+        limits = SearchLimits(max_nodes=1000)
+        negamax_move(empty_board(7), 4, 'o', limits=limits)
+        self.assertEqual(limits.nodes, 1000)
+
+    def test_time_limit(self):
+        start = time.monotonic()
+        negamax_move(empty_board(8), 4, 'o', 0.2)
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_check_interval(self):
+        limits = SearchLimits(10)
+        with self.assertRaises(TimeOut):
+            negamax(empty_board(8), 4, 'o', 20, -math.inf, math.inf,
+                    SearchLimits(0.2))
+        negamax(empty_board(5), 4, 'o', 3, -math.inf, math.inf, limits)
+        self.assertGreater(limits.interval, 16)
+
+    def test_cancel(self):
+        limits = SearchLimits(60)
+        threading.Timer(0.1, limits.cancel).start()
+        start = time.monotonic()
+        self.assertIn(negamax_move(empty_board(8), 4, 'o', limits=limits),
+                      empty_fields(empty_board(8)))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_cancel_event(self):
+        event = threading.Event()
+        event.set()
+        with self.assertRaises(TimeOut):
+            negamax(empty_board(5), 4, 'o', 3, -math.inf, math.inf,
+                    SearchLimits(cancel_event=event, resolution=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Statistics of the search made by negamax_move."""
+import collections
+
+
+Iteration = collections.namedtuple('Iteration',
+                                   'depth seconds nodes best_move value pv')
+# Record of one completed iteration of iterative deepening: time and nodes
+# are counted from the beginning of the search.
+
+
+class SearchStats:
+    """Statistics of one negamax_move search. Pass SearchStats as stats
+    parameter of negamax_move to fill it in:
+    - nodes - number of visited nodes,
+    - depth - the deepest completed iteration of iterative deepening,
+    - iterations - list of Iteration records,
+    - cutoffs - number of alpha-beta cutoffs,
+    - pv - principal variation: the best move and expected replies,
+    - move - the chosen move,
+    - source - how the move was chosen: 'search', 'book', 'exact' (solver)
+      or 'threat' (threat-space search before the search),
+    - seconds - time of the search.
+    If profile is True, times of checking for the end of the game
+    (winner_time), evaluating leaves (heuristics_time) and generating moves
+    (move_generation_time) are measured too, but it slows the search down.
+
+    Hooks are functions called as hook(event, stats) after every completed
+    iteration (event 'iteration') and at the end of search (event 'done'). """
+
+    def __init__(self, hooks=(), profile=False):
+        self.hooks = list(hooks)
+        self.profile = profile
+        self.nodes = 0
+        self.depth = 0
+        self.iterations = []
+        self.cutoffs = 0
+        self.pv = []
+        self.move = None
+        self.source = None
+        self.seconds = 0.0
+        self.winner_time = 0.0
+        self.heuristics_time = 0.0
+        self.move_generation_time = 0.0
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.seconds if self.seconds > 0 else 0.0
+
+    def add_iteration(self, depth, limits, best_move, value, pv):
+        self.nodes = limits.nodes
+        self.seconds = limits.elapsed()
+        self.depth = depth
+        self.pv = pv
+        self.iterations.append(Iteration(depth, self.seconds, self.nodes,
+                                         best_move, value, pv))
+        self.emit('iteration')
+
+    def finish(self, limits, move, source='search'):
+        self.nodes = limits.nodes
+        self.seconds = limits.elapsed()
+        self.move = move
+        self.source = source
+        self.emit('done')
+
+    def emit(self, event):
+        for hook in self.hooks:
+            hook(event, self)
+
+    def as_dict(self):
+        """Returns statistics as a dictionary, e.g. to log it as JSON."""
+        return {'nodes': self.nodes, 'seconds': self.seconds,
+                'nodes_per_second': self.nodes_per_second,
+                'depth': self.depth, 'cutoffs': self.cutoffs,
+                'move': self.move, 'source': self.source,
+                'pv': self.pv,
+                'iterations': [iteration._asdict()
+                               for iteration in self.iterations],
+                'winner_time': self.winner_time,
+                'heuristics_time': self.heuristics_time,
+                'move_generation_time': self.move_generation_time}
+
+
+def print_hook(event, stats):
+    """Hook printing progress of the search."""
+    if event == 'iteration':
+        print('depth: %i, nodes: %i, %.0f nodes/s, best move: %s, value: %s'
+              % (stats.depth, stats.nodes, stats.nodes_per_second,
+                 stats.pv[:1], stats.iterations[-1].value))
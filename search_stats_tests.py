@@ -0,0 +1,51 @@
+import unittest
+from tic_tac_toe import *
+
+
+class TestSearchStats(unittest.TestCase):
+
+    def test_stats(self):
+        events = []
+        stats = SearchStats(hooks=[lambda event, s: events.append(event)])
+        board = [['.', 'x', 'o', '.', '.', '.'], ['.', 'x', 'x', 'o', '.'],
+                 ['.', 'x', 'x', 'o'], ['o', '.', 'o'], ['.', '.'], ['.']]
+        move = negamax_move(board, 4, 'o', 1, stats=stats,
+                            threat_search=False)
+        self.assertEqual(move, (3, 1))
+        self.assertEqual(stats.move, move)
+        self.assertEqual(stats.source, 'search')
+        self.assertGreater(stats.nodes, 0)
+        self.assertGreater(stats.nodes_per_second, 0)
+        self.assertEqual(events[-1], 'done')
+        self.assertEqual(events.count('iteration'), len(stats.iterations))
+        self.assertEqual(stats.depth, stats.iterations[-1].depth)
+        self.assertEqual(stats.pv[0], move)
+        self.assertLessEqual(len(stats.pv), stats.depth)
+        self.assertEqual(stats.winner_time, 0)
+        self.assertEqual(stats.as_dict()['nodes'], stats.nodes)
+
+    def test_threat_source(self):
+        stats = SearchStats()
+        board = [['.', '.', '.', 'o', '.'], ['.', '.', '.', 'o'],
+                 ['o', 'x', 'x'], ['.', '.'], ['.']]
+        self.assertEqual(negamax_move(board, 3, 'x', 1, stats=stats), (1, 1))
+        self.assertEqual((stats.move, stats.source), ((1, 1), 'threat'))
+        self.assertEqual(stats.depth, 0)
+        self.assertEqual(stats.as_dict()['source'], 'threat')
+
+    def test_profile(self):
+        stats = SearchStats(profile=True)
+        negamax_move(empty_board(6), 4, 'o', limits=SearchLimits(
+            max_nodes=5000), stats=stats)
+        self.assertEqual(stats.nodes, 5000)
+        self.assertGreater(stats.cutoffs, 0)
+        self.assertGreater(stats.winner_time, 0)
+        self.assertGreater(stats.heuristics_time, 0)
+        self.assertGreater(stats.move_generation_time, 0)
+        for (depth, iteration) in enumerate(stats.iterations, 1):
+            self.assertEqual(iteration.depth, depth)
+            self.assertEqual(len(set(iteration.pv)), len(iteration.pv))
+
+
+if __name__ == '__main__':
+    unittest.main()
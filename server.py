@@ -0,0 +1,237 @@
+"""Asyncio game server: many games of humans against AI in one process.
+
+Every game is a Session - a coroutine waiting for human moves in its inbox
+queue and publishing moves and the result as events, so an idle game costs
+only a suspended coroutine. AI moves are computed by negamax_move in a
+bounded executor (processes by default). At most max_pending AI moves are
+computed at once; other games wait for a free slot in the order in which
+they asked (asyncio.Semaphore wakes waiters in FIFO order), so a busy server
+slows all games down equally instead of queueing work without limit. Time
+limit of a move starts when the move is computed, not when it's queued.
+
+Games can be played in-process (GameServer.new_session, Session.send_move,
+Session.events) or over TCP with a line protocol, one game per connection:
+
+    client: new <n> <k> <o|x>        (human plays o or x)
+    server: started <session id>
+    client: move <row> <column>
+    server: move <o|x> <row> <column>     (for every move in the game)
+    server: error <message>
+    server: over <o|x|.|->                (- when the game failed)
+
+Boards are at most MAX_N fields long and at most MAX_INBOX moves of a client
+can wait for processing, so one client can't exhaust memory or block the
+event loop with a huge search.
+
+    python server.py --port 8765 --workers 4 --time-limit 1
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import functools
+import itertools
+import os
+
+from tic_tac_toe import Evaluator, empty_board, get_opponent, make_move, \
+    negamax_move, winner_after
+
+MAX_N = 20  # the biggest board size of a game
+MAX_INBOX = 16  # the most human moves waiting in the inbox of a session
+
+
+class Session:
+    """One game of a human against AI on the board of size n. Human moves
+    are passed with send_move and events are put to the events queue:
+    ('move', ox, move), ('error', message) and ('over', result), where
+    result is '-' if the game failed. """
+
+    def __init__(self, server, session_id, n, k, human='o', time_limit=1.0):
+        if not 1 <= n <= MAX_N or not 1 <= k <= n or human not in ('o', 'x'):
+            raise Exception("Incorrect game settings.")
+        self.server = server
+        self.id = session_id
+        self.n = n
+        self.k = k
+        self.human = human
+        self.time_limit = time_limit
+        self.board = empty_board(n)
+        self.history = []
+        self.result = None
+        self.inbox = asyncio.Queue(MAX_INBOX)
+        self.events = asyncio.Queue()
+        self.task = None
+
+    def send_move(self, move):
+        try:
+            self.inbox.put_nowait(move)
+        except asyncio.QueueFull:
+            raise Exception("Too many moves waiting.")
+
+    def is_valid(self, move):
+        i, j = move
+        return 0 <= i and 0 <= j and i + j < self.n \
+            and self.board[i][j] == '.'
+
+    async def human_move(self):
+        while True:
+            move = await self.inbox.get()
+            if self.is_valid(move):
+                return move
+            self.events.put_nowait(('error', 'invalid move'))
+
+    async def play(self):
+        """Plays the game and returns the result."""
+        empty_count = self.n * (self.n + 1) // 2
+        evaluator = Evaluator(self.board, self.k)
+        ox = 'o'
+        while True:
+            if ox == self.human:
+                move = await self.human_move()
+            else:
+                move = await self.server.ai_move(self, ox)
+            make_move(self.board, move, ox)
+            evaluator.play(move, ox)
+            empty_count -= 1
+            self.history.append((ox, move))
+            self.events.put_nowait(('move', ox, move))
+            result = winner_after(self.board, self.k, move, ox, empty_count)
+            if result is None and evaluator.is_draw():
+                result = '.'
+            if result is not None:
+                self.result = result
+                self.events.put_nowait(('over', result))
+                return result
+            ox = get_opponent(ox)
+
+
+class GameServer:
+    """Hosts sessions. AI moves are computed by choose_move(board, k, ox,
+    time_limit=...) in executor (by default a pool of workers processes);
+    at most max_pending of them (by default workers) at once. Time limit of
+    AI moves is time_limit unless the session has its own. """
+
+    def __init__(self, executor=None, workers=None, max_pending=None,
+                 max_sessions=10000, time_limit=1.0,
+                 choose_move=negamax_move):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.own_executor = executor is None
+        if executor is None:
+            executor = concurrent.futures.ProcessPoolExecutor(workers)
+        self.executor = executor
+        self.slots = asyncio.Semaphore(max_pending or workers)
+        self.max_sessions = max_sessions
+        self.time_limit = time_limit
+        self.choose_move = choose_move
+        self.sessions = {}
+        self.ids = itertools.count(1)
+
+    def new_session(self, n, k, human='o', time_limit=None):
+        """Starts a new game and returns its Session. Raises Exception if
+        the server hosts max_sessions games. """
+        if len(self.sessions) >= self.max_sessions:
+            raise Exception("Too many games.")
+        session = Session(self, next(self.ids), n, k, human,
+                          self.time_limit if time_limit is None
+                          else time_limit)
+        self.sessions[session.id] = session
+        session.task = asyncio.ensure_future(session.play())
+        session.task.add_done_callback(
+            lambda task: self.finished(session, task))
+        return session
+
+    def finished(self, session, task):
+        """Removes the session of the finished task. If the game failed,
+        its error and the end of the game are sent to the client. """
+        self.sessions.pop(session.id, None)
+        if not task.cancelled() and task.exception() is not None:
+            session.events.put_nowait(('error', 'game failed: %s'
+                                       % task.exception()))
+            session.events.put_nowait(('over', '-'))
+
+    async def ai_move(self, session, ox):
+        async with self.slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, functools.partial(
+                    self.choose_move, [row[:] for row in session.board],
+                    session.k, ox, time_limit=session.time_limit))
+
+    async def handle_client(self, reader, writer):
+        """Plays one game with the client connected by TCP."""
+        session = None
+
+        async def send_events():
+            while True:
+                event = await session.events.get()
+                if event[0] == 'move':
+                    line = 'move %s %i %i' % (event[1], *event[2])
+                else:
+                    line = ' '.join(map(str, event))
+                writer.write((line + '\n').encode())
+                await writer.drain()
+                if event[0] == 'over':
+                    return
+
+        sender = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                words = line.decode().split() or ['']
+                try:
+                    if words[0] == 'new' and session is None:
+                        session = self.new_session(int(words[1]),
+                                                   int(words[2]), words[3])
+                        writer.write(b'started %i\n' % session.id)
+                        sender = asyncio.ensure_future(send_events())
+                    elif words[0] == 'move' and session is not None:
+                        session.send_move((int(words[1]), int(words[2])))
+                    elif words[0] == 'quit':
+                        break
+                    else:
+                        raise Exception("Unknown command.")
+                except Exception as error:
+                    writer.write(('error %s\n' % error).encode())
+                await writer.drain()
+        finally:
+            if session is not None:
+                session.task.cancel()
+            if sender is not None:
+                sender.cancel()
+            writer.close()
+
+    async def serve(self, host='localhost', port=8765):
+        """Returns asyncio.Server accepting games over TCP."""
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self):
+        for session in list(self.sessions.values()):
+            session.task.cancel()
+        if self.own_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--time-limit', type=float, default=1.0)
+    args = parser.parse_args()
+
+    async def run():
+        server = GameServer(workers=args.workers,
+                            time_limit=args.time_limit)
+        tcp_server = await server.serve(args.host, args.port)
+        try:
+            async with tcp_server:
+                await tcp_server.serve_forever()
+        finally:
+            server.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import asyncio
+import concurrent.futures
+import threading
+import unittest
+from tic_tac_toe import *
+from server import MAX_INBOX, MAX_N, GameServer
+
+
+def first_empty(board, k, ox, time_limit=None):
+    return empty_fields(board)[0]
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(2)
+        self.server = GameServer(self.executor, max_pending=2,
+                                 choose_move=first_empty)
+
+    async def asyncTearDown(self):
+        self.server.close()
+        self.executor.shutdown()
+
+    async def test_game(self):
+        session = self.server.new_session(3, 3, 'x')
+        self.assertEqual(await session.events.get(), ('move', 'o', (0, 0)))
+        session.send_move((0, 0))  # taken
+        self.assertEqual(await session.events.get(), ('error', 'invalid move'))
+        for move in (1, 0), (1, 1), (2, 0):
+            session.send_move(move)
+        self.assertEqual(await session.task, 'o')  # o: (0, 0), (0, 1), (0, 2)
+        events = []
+        while not session.events.empty():
+            events.append(session.events.get_nowait())
+        self.assertEqual(events[-1], ('over', 'o'))
+        self.assertEqual(len(session.history), 5)
+        self.assertNotIn(session.id, self.server.sessions)
+
+    async def test_backpressure(self):
+        running = []
+        most_running = []
+        release = threading.Event()
+
+        def slow(board, k, ox, time_limit=None):
+            running.append(ox)
+            most_running.append(len(running))
+            release.wait()
+            running.pop()
+            return empty_fields(board)[0]
+
+        self.server.choose_move = slow
+        sessions = [self.server.new_session(4, 3, 'x') for number in range(6)]
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(running), 2)
+        release.set()
+        for session in sessions:
+            self.assertEqual(await session.events.get(),
+                             ('move', 'o', (0, 0)))
+        self.assertEqual(max(most_running), 2)
+
+    async def test_too_many_sessions(self):
+        self.server.max_sessions = 1
+        self.server.new_session(3, 3)
+        with self.assertRaises(Exception):
+            self.server.new_session(3, 3)
+
+    async def test_limits(self):
+        for (n, k) in (MAX_N + 1, 3), (3, 4), (0, 1), (3, 0):
+            with self.assertRaises(Exception):
+                self.server.new_session(n, k)
+        session = self.server.new_session(3, 3, 'o')
+        for number in range(MAX_INBOX):
+            session.send_move((5, 5))
+        with self.assertRaises(Exception):
+            session.send_move((5, 5))
+
+    async def test_failed_game(self):
+        def broken(board, k, ox, time_limit=None):
+            raise ValueError('broken')
+
+        self.server.choose_move = broken
+        session = self.server.new_session(3, 3, 'x')
+        with self.assertRaises(ValueError):
+            await session.task
+        self.assertEqual(await session.events.get(),
+                         ('error', 'game failed: broken'))
+        self.assertEqual(await session.events.get(), ('over', '-'))
+        self.assertNotIn(session.id, self.server.sessions)
+
+    async def test_tcp(self):
+        tcp_server = await self.server.serve('127.0.0.1', 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+        async def command(line):
+            writer.write(line.encode() + b'\n')
+            await writer.drain()
+            return (await reader.readline()).decode().strip()
+
+        self.assertEqual(await command('hello'), 'error Unknown command.')
+        self.assertEqual(await command('new 100000 5 o'),
+                         'error Incorrect game settings.')
+        self.assertTrue((await command('new 3 3 o')).startswith('started'))
+        self.assertEqual(await command('move 2 0'), 'move o 2 0')
+        self.assertEqual((await reader.readline()).decode().strip(),
+                         'move x 0 0')
+        writer.close()
+        tcp_server.close()
+        await tcp_server.wait_closed()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,277 @@
+"""Exact solver and endgame tablebase.
+
+Solver finds the result of perfect play: win, loss or draw of the player to
+move and the distance to the result - number of moves until the end of the
+game, when the winner wins as fast as possible and the loser defends as long
+as possible. Results are remembered, so the same Solver should be used for
+all positions of a game.
+
+A position is identified by its index: the board read as a base-3 number
+with one digit per field (in the order of windows.board_fields; '.' is 0,
+'o' is 1 and 'x' is 2). The player to move follows from the numbers of
+symbols, because o always starts, so solving a position for the other
+player is rejected. Results are coded in one byte:
+1 + 3 * distance + outcome, 0 meaning an unknown position.
+
+Tablebase keeps results of all positions reachable from the empty board in
+an array indexed by position, so for small boards (n <= 5) the whole game
+can be solved once and saved to a file:
+
+    python solver.py 4 3 --output tablebase_4_3.bin
+"""
+import argparse
+import mmap
+import os
+import struct
+
+from search_limits import SearchLimits, TimeOut
+from tic_tac_toe import Evaluator, empty_board, get_opponent, is_draw, \
+    winner_after
+from windows import board_fields
+
+LOSS, DRAW, WIN = 0, 1, 2
+DIGITS = {'.': 0, 'o': 1, 'x': 2}
+MAX_TABLE_FIELDS = 15  # the tablebase of the board of size 5 has 14 MB
+MAGIC = b'TTTT'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBx')
+
+
+def encode(outcome, distance):
+    return 1 + 3 * distance + outcome
+
+
+def decode(code):
+    """Returns a tuple (outcome, distance) coded in code."""
+    return (code - 1) % 3, (code - 1) // 3
+
+
+def position_index(board):
+    """Returns index of the position on the board."""
+    index = 0
+    power = 1
+    for (i, j) in board_fields(len(board)):
+        index += DIGITS[board[i][j]] * power
+        power *= 3
+    return index
+
+
+def player_to_move(board):
+    """Returns the symbol of the player to move (o always starts) or None
+    if the numbers of symbols can't occur in a game. """
+    o_count = sum(row.count('o') for row in board)
+    x_count = sum(row.count('x') for row in board)
+    if o_count == x_count:
+        return 'o'
+    return 'x' if o_count == x_count + 1 else None
+
+
+def _rank(outcome, distance):
+    """Returns the key of the result sorting results from the best one."""
+    if outcome == WIN:
+        return WIN, -distance
+    return outcome, distance if outcome == LOSS else 0
+
+
+def _best_move(board, k, ox, child_code):
+    """Returns a tuple (move, outcome, distance) of the best move of ox,
+    where child_code(board) returns the code of the position after the move
+    (with the opponent to move). """
+    best = None
+    for (i, j) in board_fields(len(board)):
+        if board[i][j] != '.':
+            continue
+        board[i][j] = ox
+        if winner_after(board, k, (i, j), ox) == ox:
+            outcome, distance = WIN, 1
+        elif is_draw(board, k):
+            outcome, distance = DRAW, 1
+        else:
+            code = child_code(board)
+            if code == 0:
+                board[i][j] = '.'
+                return None
+            outcome, distance = decode(code)
+            outcome, distance = 2 - outcome, distance + 1
+        board[i][j] = '.'
+        if best is None or _rank(outcome, distance) > _rank(*best[1:]):
+            best = (i, j), outcome, distance
+    return best
+
+
+class _Memo(dict):
+    def __missing__(self, index):
+        return 0
+
+
+class Solver:
+    """Exact solver of the game (n, k) used for positions with at most
+    max_empty empty fields (None means any position). Results are kept in a
+    dictionary, except for solvers of whole small games (max_empty None),
+    which visit most positions, so an array (like in Tablebase) is used. """
+
+    def __init__(self, n, k, max_empty=12):
+        self.n = n
+        self.k = k
+        self.max_empty = max_empty
+        self.fields = board_fields(n)
+        self.powers = [3 ** number for number in range(len(self.fields))]
+        self.memo = bytearray(3 ** len(self.fields)) \
+            if max_empty is None and len(self.fields) <= MAX_TABLE_FIELDS \
+            else _Memo()
+        self.evaluator = None
+        self.limits = None
+
+    def solve(self, board, ox, limits=None):
+        """Returns a tuple (outcome, distance) of the position with ox to
+        move. If the game is already over, distance is 0. Raises Exception
+        if it isn't ox's turn and TimeOut when limits (SearchLimits) are
+        exceeded; results found until then are kept. """
+        if not isinstance(board, list):
+            board = board.to_board()  # BitBoard
+        if player_to_move(board) != ox:
+            raise Exception("It isn't %s's turn." % ox)
+        evaluator = Evaluator(board, self.k)
+        if evaluator.o_lines or evaluator.x_lines:
+            return (WIN if evaluator.o_lines and ox == 'o'
+                    or evaluator.x_lines and ox == 'x' else LOSS), 0
+        if evaluator.is_draw():
+            return DRAW, 0
+        self.evaluator = evaluator
+        self.limits = limits or SearchLimits()
+        return decode(self._solve(ox, position_index(board)))
+
+    def _solve(self, ox, index):
+        """Returns the code of the position with ox to move kept by
+        self.evaluator, which has the index. """
+        code = self.memo[index]
+        if code:
+            return code
+        limits = self.limits
+        limits.nodes += 1
+        if limits.nodes >= limits.next_check:
+            limits.check()
+        evaluator = self.evaluator
+        board = evaluator.board
+        opponent = get_opponent(ox)
+        digit = DIGITS[ox]
+        best = None
+        for (number, field) in enumerate(self.fields):
+            if board[field[0]][field[1]] != '.':
+                continue
+            evaluator.play(field, ox)
+            if evaluator.o_lines if ox == 'o' else evaluator.x_lines:
+                outcome, distance = WIN, 1
+            elif evaluator.is_draw():
+                outcome, distance = DRAW, 1
+            else:
+                child = self._solve(opponent,
+                                    index + digit * self.powers[number])
+                outcome, distance = 2 - (child - 1) % 3, (child - 1) // 3 + 1
+            evaluator.undo(field, ox)
+            if best is None or _rank(outcome, distance) > _rank(*best):
+                best = outcome, distance
+        code = encode(*best)
+        self.memo[index] = code
+        return code
+
+    def best_move(self, board, ox, limits=None):
+        """Returns the best move of ox or None if the position has more than
+        max_empty empty fields, it isn't ox's turn or the position wasn't
+        solved within limits (SearchLimits). """
+        if not isinstance(board, list):
+            board = board.to_board()  # BitBoard
+        board = [row[:] for row in board]
+        if self.max_empty is not None and sum(
+                row.count('.') for row in board) > self.max_empty \
+                or player_to_move(board) != ox:
+            return None
+        limits = limits or SearchLimits()
+
+        def child_code(child):
+            return encode(*self.solve(child, get_opponent(ox), limits))
+
+        try:
+            return _best_move(board, self.k, ox, child_code)[0]
+        except TimeOut:
+            return None
+
+
+class Tablebase:
+    """Results of all positions of the game (n, k) reachable from the empty
+    board kept in a bytearray (or a memory-mapped file) indexed by position
+    index. """
+
+    def __init__(self, n, k, table):
+        self.n = n
+        self.k = k
+        self.table = table
+
+    @classmethod
+    def build(cls, n, k):
+        """Solves the game and returns its Tablebase."""
+        if n * (n + 1) // 2 > MAX_TABLE_FIELDS:
+            raise Exception("Board too big for a tablebase.")
+        solver = Solver(n, k, None)
+        solver.solve(empty_board(n), 'o')
+        return cls(n, k, solver.memo)
+
+    @classmethod
+    def load(cls, path):
+        """Returns Tablebase saved to the file. The file is memory-mapped."""
+        with open(path, 'rb') as file:
+            # Empty files can't be mapped.
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise Exception("Not a tablebase: %s" % path)
+            table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, k = HEADER.unpack_from(table)
+        if magic != MAGIC or version != VERSION \
+                or len(table) != HEADER.size + 3 ** (n * (n + 1) // 2):
+            table.close()
+            raise Exception("Not a tablebase: %s" % path)
+        return cls(n, k, memoryview(table)[HEADER.size:])
+
+    def save(self, path):
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.n, self.k))
+            file.write(self.table)
+
+    def lookup(self, board):
+        """Returns a tuple (outcome, distance) of the position for the player
+        to move or None if the position isn't in the tablebase (it can't be
+        reached in the game or the game is over). """
+        if not isinstance(board, list):
+            board = board.to_board()  # BitBoard
+        code = self.table[position_index(board)]
+        return decode(code) if code else None
+
+    def best_move(self, board, ox, limits=None):
+        """Returns the best move of ox or None if the position isn't in the
+        tablebase (or it isn't ox's turn). Parameter limits is accepted like
+        in Solver.best_move, but lookups are immediate. """
+        if not isinstance(board, list):
+            board = board.to_board()  # BitBoard
+        if len(board) != self.n or player_to_move(board) != ox \
+                or not self.table[position_index(board)]:
+            return None
+        result = _best_move([row[:] for row in board], self.k, ox,
+                            lambda child: self.table[position_index(child)])
+        return result and result[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('n', type=int, help='board size')
+    parser.add_argument('k', type=int, help='number of symbols to win')
+    parser.add_argument('--output', required=True, help='tablebase file')
+    args = parser.parse_args()
+
+    tablebase = Tablebase.build(args.n, args.k)
+    tablebase.save(args.output)
+    outcome, distance = tablebase.lookup(empty_board(args.n))
+    print('%s in %i moves' % (('o loses', 'draw', 'o wins')[outcome],
+                              distance))
+
+
+if __name__ == "__main__":
+    main()
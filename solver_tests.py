@@ -0,0 +1,145 @@
+import os
+import random
+import tempfile
+import time
+import unittest
+from tic_tac_toe import *
+from solver import DRAW, LOSS, WIN, Solver, Tablebase, position_index
+
+
+def plain_solve(board, k, ox):
+    """Returns (outcome, distance) computed by plain minimax."""
+    best = None
+    for move in empty_fields(board):
+        make_move(board, move, ox)
+        if winner_after(board, k, move, ox) == ox:
+            result = WIN, 1
+        elif is_draw(board, k):
+            result = DRAW, 1
+        else:
+            outcome, distance = plain_solve(board, k, get_opponent(ox))
+            result = 2 - outcome, distance + 1
+        make_move(board, move, '.')
+        if best is None or rank(result) > rank(best):
+            best = result
+    return best
+
+
+def rank(result):
+    outcome, distance = result
+    return outcome, -distance if outcome == WIN \
+        else distance if outcome == LOSS else 0
+
+
+class TestSolver(unittest.TestCase):
+
+    def test_position_index(self):
+        board = empty_board(3)
+        self.assertEqual(position_index(board), 0)
+        make_move(board, (0, 1), 'o')
+        make_move(board, (2, 0), 'x')
+        self.assertEqual(position_index(board), 1 * 3 + 2 * 3 ** 5)
+
+    def test_known_results(self):
+        self.assertEqual(Solver(3, 3).solve(empty_board(3), 'o')[0], DRAW)
+        self.assertEqual(Solver(3, 2).solve(empty_board(3), 'o'), (WIN, 3))
+        self.assertEqual(Solver(4, 3).solve(empty_board(4), 'o')[0], WIN)
+        board = empty_board(3)
+        for (move, ox) in ((0, 0), 'o'), ((1, 0), 'x'), ((0, 1), 'o'), \
+                ((1, 1), 'x'), ((0, 2), 'o'):
+            make_move(board, move, ox)
+        self.assertEqual(Solver(3, 3).solve(board, 'x'), (LOSS, 0))
+
+    def test_compare_with_minimax(self):
+        rand = random.Random(0)
+        for (n, k) in (3, 2), (3, 3), (4, 3), (4, 4):
+            solver = Solver(n, k, None)
+            for game in range(5):
+                board = empty_board(n)
+                for number in range(n * (n + 1) // 2 - 7):
+                    make_move(board, rand.choice(empty_fields(board)),
+                              'ox'[number % 2])
+                ox = 'ox'[(n * (n + 1) // 2 - len(empty_fields(board))) % 2]
+                if winner(board, k) is not None or is_draw(board, k):
+                    continue
+                self.assertEqual(solver.solve(board, ox),
+                                 plain_solve(board, k, ox))
+
+    def test_best_move(self):
+        board = empty_board(4)
+        for (move, ox) in ((0, 0), 'o'), ((3, 0), 'x'), ((0, 1), 'o'):
+            make_move(board, move, ox)
+        solver = Solver(4, 3)
+        self.assertEqual(solver.best_move(board, 'x'), (0, 2))  # block
+        self.assertIsNone(Solver(4, 3, 5).best_move(board, 'x'))
+        self.assertEqual(negamax_move(board, 3, 'x', exact=solver), (0, 2))
+        with self.assertRaises(Exception):
+            negamax_move(board, 4, 'x', exact=solver)
+
+    def test_player_to_move(self):
+        board = empty_board(4)
+        make_move(board, (0, 0), 'o')
+        make_move(board, (1, 0), 'x')
+        solver = Solver(4, 3)
+        result = solver.solve(board, 'o')
+        self.assertRaises(Exception, solver.solve, board, 'x')
+        self.assertIsNone(solver.best_move(board, 'x'))
+        self.assertEqual(solver.solve(board, 'o'), result)
+        self.assertIsNone(Tablebase.build(4, 3).best_move(board, 'x'))
+
+    def test_limits(self):
+        board = empty_board(5)
+        solver = Solver(5, 3, None)
+        self.assertIsNone(solver.best_move(board, 'o',
+                                           SearchLimits(max_nodes=100)))
+        self.assertIsInstance(solver.memo, bytearray)
+        self.assertNotIsInstance(Solver(5, 3).memo, bytearray)
+        start = time.time()
+        move = negamax_move(board, 3, 'o', 0.5, exact=solver,
+                            threat_search=False)
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(board[move[0]][move[1]], '.')
+
+
+class TestTablebase(unittest.TestCase):
+
+    def test_build_save_and_load(self):
+        tablebase = Tablebase.build(4, 3)
+        self.assertEqual(tablebase.lookup(empty_board(4)), (WIN, 7))
+        solver = Solver(4, 3)
+        board = empty_board(4)
+        for number in range(6):
+            ox = 'ox'[number % 2]
+            result = tablebase.lookup(board)
+            self.assertEqual(result, solver.solve(board, ox))
+            move = tablebase.best_move(board, ox)
+            make_move(board, move, ox)
+            if winner_after(board, 3, move, ox) is not None:
+                self.assertEqual(result, (WIN, 1))
+                break
+            self.assertEqual(tablebase.lookup(board)[0], 2 - result[0])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tablebase.bin')
+            tablebase.save(path)
+            loaded = Tablebase.load(path)
+            self.assertEqual((loaded.n, loaded.k), (4, 3))
+            self.assertEqual(bytes(loaded.table), bytes(tablebase.table))
+            self.assertEqual(negamax_move(empty_board(4), 3, 'o',
+                                          exact=loaded),
+                             tablebase.best_move(empty_board(4), 'o'))
+            del loaded
+        with self.assertRaises(Exception):
+            Tablebase.build(6, 3)
+
+    def test_invalid_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tablebase.bin')
+            for data in (b'', b'TTT', b'TTTT\x01\x04\x03\x00'):
+                with open(path, 'wb') as file:
+                    file.write(data)
+                with self.assertRaisesRegex(Exception, 'Not a tablebase'):
+                    Tablebase.load(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
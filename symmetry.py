@@ -0,0 +1,77 @@
+"""Symmetry of the triangular board.
+
+Swapping row and column numbers, (i, j) -> (j, i), maps the board onto
+itself and swaps horizontal lines with vertical ones, while diagonals stay
+diagonals, so the transposed position has the same value and the best moves
+are transposed too. It's the only symmetry preserving the lines of the game.
+"""
+from bitboard import BitBoard
+from transposition import zobrist_keys
+
+
+def transpose(board):
+    """Returns a new board with rows and columns swapped."""
+    if isinstance(board, BitBoard):
+        return BitBoard.from_board(transpose(board.to_board()))
+    n = len(board)
+    return [[board[j][i] for j in range(n - i)] for i in range(n)]
+
+
+def transpose_move(move):
+    return move[1], move[0]
+
+
+def is_symmetric(board):
+    """Checks if the board is the same after transposition."""
+    if isinstance(board, BitBoard):
+        board = board.to_board()
+    n = len(board)
+    return all(board[i][j] == board[j][i]
+               for i in range(n) for j in range(i + 1, n - i))
+
+
+def canonical(board):
+    """Returns a tuple: the representative of the board's symmetry class
+    (the smaller of the board and its transposition) and True if it is the
+    transposition or False otherwise. Moves for the representative can be
+    mapped back with map_move. """
+    if isinstance(board, BitBoard):
+        representative, transposed = canonical(board.to_board())
+        return BitBoard.from_board(representative), transposed
+    transposed = transpose(board)
+    if transposed < board:
+        return transposed, True
+    return board, False
+
+
+def map_move(move, transposed):
+    """Maps move between the board and its representative returned by
+    canonical (in both directions). """
+    return transpose_move(move) if transposed else move
+
+
+def canonical_hash(board, ox):
+    """Returns a tuple: Zobrist hash of the board with ox to move, which is
+    the same for the board and its transposition, and True if it's the hash
+    of the transposition (moves stored under the hash should be mapped with
+    map_move) or False otherwise. """
+    if isinstance(board, BitBoard):
+        board = board.to_board()
+    keys = zobrist_keys(len(board))
+    key = transposed_key = keys.side if ox == 'x' else 0
+    for (i, row) in enumerate(board):
+        for (j, content) in enumerate(row):
+            if content != '.':
+                key ^= keys.fields[content][i][j]
+                transposed_key ^= keys.fields[content][j][i]
+    if transposed_key < key:
+        return transposed_key, True
+    return key, False
+
+
+def unique_moves(board, moves):
+    """Returns moves without those which are transpositions of other moves
+    on a symmetric board. On other boards all moves are returned. """
+    if not is_symmetric(board):
+        return moves
+    return [move for move in moves if move[0] <= move[1]]
@@ -0,0 +1,90 @@
+import random
+import unittest
+from tic_tac_toe import *
+from symmetry import canonical, canonical_hash, is_symmetric, map_move, \
+    transpose, unique_moves
+
+
+def random_board(n, stones, rand, k=None):
+    """Returns the board after random moves. If k is given, moves stop when
+    somebody wins. """
+    board = empty_board(n)
+    for number in range(stones):
+        move = rand.choice(empty_fields(board))
+        make_move(board, move, 'ox'[number % 2])
+        if k is not None and winner_after(board, k, move, 'ox'[number % 2]):
+            break
+    return board
+
+
+class TestSymmetry(unittest.TestCase):
+
+    def test_transpose(self):
+        board = empty_board(4)
+        make_move(board, (0, 2), 'o')
+        make_move(board, (3, 0), 'x')
+        transposed = transpose(board)
+        self.assertEqual(transposed[2][0], 'o')
+        self.assertEqual(transposed[0][3], 'x')
+        self.assertEqual(len(empty_fields(transposed)), 8)
+        self.assertEqual(transpose(transposed), board)
+        self.assertEqual(transpose(BitBoard.from_board(board)),
+                         BitBoard.from_board(transposed))
+
+    def test_values_are_preserved(self):
+        rand = random.Random(0)
+        for n in range(3, 8):
+            for k in range(2, n + 1):
+                board = random_board(n, n, rand, k)
+                transposed = transpose(board)
+                self.assertEqual(winner(transposed, k), winner(board, k))
+                self.assertEqual(is_draw(transposed, k), is_draw(board, k))
+                self.assertEqual(heuristics(transposed, k, 'o'),
+                                 heuristics(board, k, 'o'))
+
+    def test_canonical(self):
+        rand = random.Random(1)
+        for n in range(3, 8):
+            board = random_board(n, n, rand)
+            representative, transposed = canonical(board)
+            self.assertEqual(canonical(transpose(board))[0], representative)
+            self.assertEqual(canonical(BitBoard.from_board(board))[0],
+                             BitBoard.from_board(representative))
+            # Mapping moves to the representative and back:
+            for move in empty_fields(board):
+                mapped = map_move(move, transposed)
+                self.assertEqual(representative[mapped[0]][mapped[1]], '.')
+                self.assertEqual(map_move(mapped, transposed), move)
+
+    def test_canonical_hash(self):
+        rand = random.Random(2)
+        for n in range(3, 8):
+            board = random_board(n, n, rand)
+            for ox in 'ox':
+                key, transposed = canonical_hash(board, ox)
+                self.assertEqual(canonical_hash(transpose(board), ox)[0], key)
+                self.assertEqual(zobrist_hash(
+                    transpose(board) if transposed else board, ox), key)
+        self.assertEqual(canonical_hash(empty_board(5), 'o'), (0, False))
+
+    def test_unique_moves(self):
+        board = empty_board(4)
+        self.assertTrue(is_symmetric(board))
+        self.assertEqual(len(unique_moves(board, empty_fields(board))), 6)
+        make_move(board, (1, 1), 'o')
+        self.assertTrue(is_symmetric(board))
+        self.assertEqual(len(unique_moves(board, empty_fields(board))), 5)
+        make_move(board, (0, 1), 'x')
+        self.assertFalse(is_symmetric(board))
+        self.assertEqual(len(unique_moves(board, empty_fields(board))), 8)
+
+    def test_negamax_move_on_symmetric_board(self):
+        stats = SearchStats()
+        move = negamax_move(empty_board(5), 3, 'o', None, seed=0,
+                            stats=stats, max_depth=2)
+        self.assertLessEqual(move[0], move[1])
+        self.assertEqual(stats.depth, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Threat-space search: forced wins found before the full-width search.
+
+A threat is a window in which a player misses only one symbol (and which
+contains no opponent's symbols), so the player wins on its empty field at
+the next move unless the opponent blocks it. Full-width alpha-beta sees a
+sequence of threats only as deep as it searches, but such sequences are
+narrow: the opponent has only one reasonable reply to a threat. So
+threat_move checks, in order:
+1. a move completing a line (win),
+2. the only field on which the opponent would complete a line (mandatory
+   block),
+3. victory by continuous threats (VCF): a sequence of moves each making a
+   threat, answered by the forced blocks, ending with two threats at once
+   (the opponent can block only one) or with a line.
+Only moves making threats are searched, so even long sequences are found in
+milliseconds. A sequence is accepted only if the opponent can't complete
+own line in between, so every found win is really forced.
+"""
+from search_limits import SearchLimits, TimeOut
+from windows import Evaluator
+
+WIN = 'win'
+BLOCK = 'block'
+VCF = 'vcf'
+
+
+def threat_move(board, k, ox, max_depth=10, max_nodes=20000, limits=None):
+    """Returns a tuple (move, kind) where kind is WIN, BLOCK or VCF (see
+    above) or None if there is no such move. VCF sequences have at most
+    max_depth moves of ox and the search visits at most max_nodes
+    positions. Visited positions are counted in limits (SearchLimits) of
+    the caller, if given, and VCF isn't found when they are exceeded or the
+    search is cancelled. """
+    if k < 2:
+        return None
+    evaluator = Evaluator(board, k)
+    opponent = 'x' if ox == 'o' else 'o'
+    wins = evaluator.threat_fields(ox)
+    if wins:
+        return wins[0], WIN
+    blocks = evaluator.threat_fields(opponent)
+    if len(blocks) == 1:
+        return blocks[0], BLOCK
+    if blocks:
+        return None  # lost anyway, the search will find the longest defense
+    if limits is None:
+        limits = SearchLimits()
+    try:
+        limits.check()
+        sequence = vcf(evaluator, ox, max_depth, limits,
+                       limits.nodes + max_nodes)
+    except TimeOut:
+        return None
+    return (sequence[0], VCF) if sequence else None
+
+
+def threat_candidates(evaluator, ox):
+    """Returns empty fields on which ox would make a threat."""
+    if ox == 'o':
+        counts, other_counts = evaluator.o_counts, evaluator.x_counts
+    else:
+        counts, other_counts = evaluator.x_counts, evaluator.o_counts
+    k_2 = evaluator.k - 2
+    board = evaluator.board
+    result = []
+    for (window, count) in enumerate(counts):
+        if count == k_2 and other_counts[window] == 0:
+            for (i, j) in evaluator.windows[window]:
+                if board[i][j] == '.' and (i, j) not in result:
+                    result.append((i, j))
+    return result
+
+
+def vcf(evaluator, ox, depth, limits, max_nodes):
+    """Returns the list of moves of a victory by continuous threats of ox
+    (moves of ox and forced replies of the opponent) in the position of
+    evaluator with ox to move, in which nobody has a threat, or None if it
+    wasn't found in depth moves of ox. Raises TimeOut when limits are
+    exceeded or limits.nodes reaches max_nodes. """
+    if depth == 0:
+        return None
+    opponent = 'x' if ox == 'o' else 'o'
+    for move in threat_candidates(evaluator, ox):
+        limits.nodes += 1
+        if limits.nodes >= limits.next_check:
+            limits.check()
+        if limits.nodes >= max_nodes:
+            raise TimeOut
+        evaluator.play(move, ox)
+        try:
+            if evaluator.threat_fields(opponent):
+                continue  # the opponent would complete a line first
+            threats = evaluator.threat_fields(ox)
+            if len(threats) > 1:
+                return [move]
+            block = threats[0]
+            evaluator.play(block, opponent)
+            try:
+                if evaluator.threat_fields(opponent):
+                    continue  # the block made opponent's threat
+                sequence = vcf(evaluator, ox, depth - 1, limits, max_nodes)
+            finally:
+                evaluator.undo(block, opponent)
+            if sequence is not None:
+                return [move, block] + sequence
+        finally:
+            evaluator.undo(move, ox)
+    return None
@@ -0,0 +1,59 @@
+import random
+import unittest
+from tic_tac_toe import *
+from solver import WIN, Solver
+from threats import BLOCK, VCF, WIN as THREAT_WIN, threat_move
+
+
+class TestThreatSearch(unittest.TestCase):
+
+    def test_win_and_block(self):
+        board = [['o', 'o', '.', '.'], ['x', '.', '.'], ['x', '.'], ['.']]
+        self.assertEqual(threat_move(board, 3, 'o'), ((0, 2), THREAT_WIN))
+        self.assertEqual(threat_move(board, 3, 'x'), ((3, 0), THREAT_WIN))
+        board[2][0] = '.'
+        self.assertEqual(threat_move(board, 3, 'x'), ((0, 2), BLOCK))
+        self.assertIsNone(threat_move(empty_board(4), 3, 'o'))
+        self.assertIsNone(threat_move(empty_board(4), 1, 'o'))
+
+    def test_vcf(self):
+        board = [['.', '.', '.', 'o', '.'], ['.', '.', '.', 'o'],
+                 ['o', 'x', 'x'], ['.', '.'], ['.']]
+        self.assertEqual(threat_move(board, 3, 'x'), ((1, 1), VCF))
+        self.assertEqual(negamax_move(board, 3, 'x', None, max_depth=1),
+                         (1, 1))
+        self.assertIsNone(threat_move(board, 3, 'x', max_depth=0))
+
+    def test_limits(self):
+        board = [['.', '.', '.', 'o', '.'], ['.', '.', '.', 'o'],
+                 ['o', 'x', 'x'], ['.', '.'], ['.']]
+        limits = SearchLimits()
+        self.assertEqual(threat_move(board, 3, 'x', limits=limits),
+                         ((1, 1), VCF))
+        self.assertGreater(limits.nodes, 0)
+        limits.cancel()
+        self.assertIsNone(threat_move(board, 3, 'x', limits=limits))
+        limits = SearchLimits(max_nodes=1)
+        self.assertIsNone(threat_move(board, 3, 'x', limits=limits))
+        self.assertIsNone(threat_move(board, 3, 'x', max_nodes=1))
+
+    def test_found_wins_are_forced(self):
+        rand = random.Random(0)
+        solver = Solver(5, 3, None)
+        found = 0
+        while found < 5:
+            board = empty_board(5)
+            for number in range(7):
+                move = rand.choice(empty_fields(board))
+                make_move(board, move, 'ox'[number % 2])
+                if winner_after(board, 3, move, 'ox'[number % 2]):
+                    break
+            else:
+                result = threat_move(board, 3, 'x')
+                if result is not None and result[1] == VCF:
+                    found += 1
+                    self.assertEqual(solver.solve(board, 'x')[0], WIN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,30 @@
 import copy
+import importlib
 import random
 import math
 import time
 import warnings
 
+from search_limits import SearchLimits, TimeOut
+
+# Names of other modules available from this module (e.g. BitBoard). They
+# are imported on first use, so importing tic_tac_toe to play a game stays
+# cheap.
+_LAZY = {'BitBoard': 'bitboard', 'MoveOrdering': 'ordering',
+         'SearchStats': 'search_stats', 'unique_moves': 'symmetry',
+         'threat_move': 'threats', 'TranspositionTable': 'transposition',
+         'zobrist_hash': 'transposition', 'Evaluator': 'windows',
+         'winning_windows': 'windows'}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError("module %r has no attribute %r"
+                             % (__name__, name))
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
 
 def empty_board(n):
     if n < 1:
@@ -12,6 +33,8 @@ def empty_board(n):
 
 
 def board_print(board):
+    if not isinstance(board, list):  # BitBoard
+        board = board.to_board()
     for row in board:
         for field in row:
             print(field, end=' ')
@@ -56,6 +79,8 @@ def human_move(board, k, ox):
 
 def make_move(board, field, ox):
     """Changes board by putting ox on the field."""
+    if not isinstance(board, list):  # BitBoard
+        return board.make_move(field, ox)
     board[field[0]][field[1]] = ox
 
 
@@ -86,6 +111,8 @@ def winner(board, k):
     is not over, returns None. This function fails if both players has k
     symbols in one line (then it will return one of them), but this should
     not happen in the game. """
+    if not isinstance(board, list):  # BitBoard
+        return board.winner(k)
 
     is_any_field_free = False  # necessary to choose to return '.' or None
     for (x, row) in enumerate(board):
@@ -103,16 +130,33 @@ def winner(board, k):
     return None if is_any_field_free else '.'
 
 
+def winner_after(board, k, move, ox, empty_count=None):
+    """Same as winner, but assumes that the game wasn't over before ox played
+    move, so only lines going through move are checked. Parameter
+    empty_count is a number of empty fields left on the board - it makes
+    recognizing a full board immediate. If it is None, fields are counted. """
+    if not isinstance(board, list):  # BitBoard
+        return board.winner_after(k, move, ox, empty_count)
+    x, y = move
+    for (vx, vy) in (0, 1), (1, 0), (1, 1), (1, -1):
+        if allies_number(board, ox, x, y, vx, vy) \
+                + allies_number(board, ox, x, y, -vx, -vy) + 1 >= k:
+            return ox
+    if empty_count is None:
+        empty_count = len(empty_fields(board))
+    return None if empty_count else '.'
+
+
 def is_draw(board, k):
     """Returns True when game is already drawn (even if players can still
-    play moves) or False otherwise """
-    for ox in 'o', 'x':
-        board_cpy = copy.deepcopy(board)
-        for row in board_cpy:
-            for i, content in enumerate(row):
-                if content == '.':
-                    row[i] = ox
-        if winner(board_cpy, k) != '.':
+    play moves) or False otherwise. It happens when every line of k fields
+    contains both symbols. """
+    if not isinstance(board, list):  # BitBoard
+        return board.is_draw(k)
+    from windows import winning_windows
+    for window in winning_windows(len(board), k):
+        contents = [board[i][j] for (i, j) in window]
+        if 'o' not in contents or 'x' not in contents:
             return False
     return True
 
@@ -121,18 +165,23 @@ def begin(choose_move_o, choose_move_x, n, k):
     """Plays a game on the board of length n, where k symbols in line are
     needed for victory. Returns tuple: (final board state, winner symbol or
     '.' in case of draw, history as a list of tuples (symbol, move)). """
+    from windows import Evaluator
     board = empty_board(n)
     history = []
+    empty_count = n * (n + 1) // 2
+    evaluator = Evaluator(board, k)
     while True:
         for ox in 'ox':
             move = choose_move_o(board, k, 'o') if ox == 'o' \
                 else choose_move_x(board, k, 'x')
             make_move(board, move, ox)
+            evaluator.play(move, ox)
+            empty_count -= 1
             history.append((ox, move))
-            result = winner(board, k)
+            result = winner_after(board, k, move, ox, empty_count)
             if result is not None:
                 return board, result, history
-            if is_draw(board, k):
+            if evaluator.is_draw():
                 # Some positions can be a draw even if there
                 # are still empty fields
                 return board, '.', history
@@ -149,6 +198,8 @@ def history_print(history, n):
 
 def fields_with_symbol(board, s):
     """Returns a list of fields (tuples of coordinates) containing symbol s."""
+    if not isinstance(board, list):  # BitBoard
+        return board.fields_with_symbol(s)
     result = []
     for i, row in enumerate(board):
         for j, symbol in enumerate(row):
@@ -314,41 +365,23 @@ def heuristics(board, k, ox):
     >>> heuristics(b, 3, 'x')  # 2 horizontal + 1 vertical
     3
     """
-    n = len(board)  # board size
+    if not isinstance(board, list):  # BitBoard
+        return board.heuristics(k, ox)
+    from windows import winning_windows
+    opponent = get_opponent(ox)
     result = 0
-    for (i, row) in enumerate(board):
-        for (j, content) in enumerate(row):
-            # Scanning board in four directions:
-            for (x, y) in (0, 1), (-1, 0), (-1, 1), (-1, -1):
-                who = None if content == '.' else content
-                partial_result = 0
-                i_last, j_last = i + (k - 1) * x, j + (k - 1) * y
-                if i_last + j_last >= n or i_last < 0 or j_last < 0:
-                    # Continue when it is impossible to get k symbols in a line
-                    continue
-                for m in range(k):
-                    i_next, j_next = i + m * x, j + m * y
-                    next_content = board[i_next][j_next]
-                    # next_content is a content of the field which
-                    # may form a line together with (i, j) field
-                    if next_content != '.':
-                        if who == next_content:
-                            partial_result += 1
-                        elif who is None:
-                            who = next_content
-                            partial_result += 1
-                        else:
-                            # Opponent interrupts our line and thus we zero
-                            # the result. It is impossible to score k symbols
-                            # in a line now, so break
-                            partial_result = 0
-                            break
-                if partial_result == k:  # End of game
-                    return math.inf if content == ox else -math.inf
-                if who == ox:
-                    result += partial_result
-                elif who == get_opponent(ox):
-                    result -= partial_result
+    for window in winning_windows(len(board), k):
+        contents = [board[i][j] for (i, j) in window]
+        count = contents.count(ox)
+        opponent_count = contents.count(opponent)
+        if count and opponent_count:
+            # It is impossible to score k symbols in this line.
+            continue
+        if count == k:  # End of game
+            return math.inf
+        if opponent_count == k:
+            return -math.inf
+        result += count - opponent_count
     return result
 
 
@@ -365,54 +398,237 @@ def field_values(n, k):
     board_print(result)
 
 
-class TimeOut(Exception):
-    pass
-
-
-def negamax(board, k, ox, depth, alpha, beta, start_time, time_limit):
-    if time.time() - start_time > time_limit:
-        raise TimeOut
-    if depth == 0 or winner(board, k) is not None:
-        return heuristics(board, k, ox)
+def negamax(board, k, ox, depth, alpha, beta, limits, last_move=None,
+            empty_count=None, tt=None, key=0, evaluator=None, stats=None,
+            ordering=None, pvs=False):
+    """Evaluates board from ox's viewpoint with negamax algorithm with
+    alpha-beta pruning checking moves up to depth. The search is stopped by
+    TimeOut exception according to limits (SearchLimits). Parameter
+    last_move is the move just played by the opponent and empty_count is a
+    number of empty fields. When last_move is given, only lines going through
+    it are checked for the end of the game. Parameter tt is a
+    TranspositionTable used to remember values of positions and key is
+    Zobrist hash of the position. If evaluator (Evaluator of the board) is
+    given, it's used instead of heuristics and winner and is kept up to date
+    with moves. Cutoffs and (if stats.profile) times are counted in stats
+    (SearchStats). Moves are searched in the order given by ordering
+    (MoveOrdering); without it only the move from tt is searched first.
+    If pvs is True, principal variation search is used: moves after the
+    first one are searched with a null window only to prove that they
+    aren't better, and searched again with the full window if they are. """
+    limits.nodes += 1
+    if limits.nodes >= limits.next_check:
+        limits.check()
     opponent = 'o' if ox == 'x' else 'x'
+    profile = stats is not None and stats.profile
+    if profile:
+        started = time.perf_counter()
+    if depth == 0:
+        over = True
+    elif evaluator is not None:
+        # Full board or nobody can win anymore:
+        over = evaluator.o_lines or evaluator.x_lines or evaluator.is_draw()
+    else:
+        over = (winner(board, k) if last_move is None else
+                winner_after(board, k, last_move, opponent, empty_count)) \
+            is not None
+    if profile:
+        now = time.perf_counter()
+        stats.winner_time += now - started
+        started = now
+    if over:
+        value = heuristics(board, k, ox) if evaluator is None \
+            else evaluator.heuristics(ox)
+        if profile:
+            stats.heuristics_time += time.perf_counter() - started
+        return value
+    moves = empty_fields(board)
+    tt_move = None
+    if tt is not None:
+        entry = tt.lookup(key)
+        if entry is not None:
+            _, entry_depth, value, kind, tt_move, _ = entry
+            if entry_depth >= depth and (
+                    kind == tt.EXACT
+                    or kind == tt.LOWER and value >= beta
+                    or kind == tt.UPPER and value <= alpha):
+                return value
+            if tt_move not in moves:
+                tt_move = None
+        keys = tt.keys.fields[ox]
+        opponent_key = key ^ tt.keys.side  # the key of the opponent to move
+    if ordering is not None:
+        moves = ordering.order(moves, ox, evaluator, tt_move)
+    elif tt_move is not None:
+        # The best move found previously is searched first:
+        moves.remove(tt_move)
+        moves.insert(0, tt_move)
+    if profile:
+        stats.move_generation_time += time.perf_counter() - started
+    alpha_start = alpha
     best_val = -math.inf
-    for move in empty_fields(board):
+    best_move = moves[0]
+    for move in moves:
         make_move(board, move, ox)
-        move_val = -negamax(board, k, opponent, depth - 1, -beta, -alpha,
-                            start_time, time_limit)
+        if evaluator is not None:
+            evaluator.play(move, ox)
+        move_key = opponent_key ^ keys[move[0]][move[1]] \
+            if tt is not None else 0
+        if pvs and move is not moves[0] and alpha > -math.inf:
+            # Values are integers, so (alpha, alpha + 1) is a null window.
+            move_val = -negamax(board, k, opponent, depth - 1, -alpha - 1,
+                                -alpha, limits, move, len(moves) - 1, tt,
+                                move_key, evaluator, stats, ordering, pvs)
+            if alpha < move_val < beta:
+                move_val = -negamax(board, k, opponent, depth - 1, -beta,
+                                    -alpha, limits, move, len(moves) - 1, tt,
+                                    move_key, evaluator, stats, ordering, pvs)
+        else:
+            move_val = -negamax(board, k, opponent, depth - 1, -beta, -alpha,
+                                limits, move, len(moves) - 1, tt, move_key,
+                                evaluator, stats, ordering, pvs)
         make_move(board, move, '.')  # undo move
+        if evaluator is not None:
+            evaluator.undo(move, ox)
         if move_val > best_val:
             best_val = move_val
+            best_move = move
         if best_val > alpha:
             alpha = best_val
-        if alpha > beta:
-            return alpha
+        if alpha > beta or pvs and alpha >= beta:
+            if stats is not None:
+                stats.cutoffs += 1
+            if ordering is not None:
+                ordering.cutoff(move, len(moves), depth)
+            break
+    if tt is not None:
+        kind = tt.UPPER if best_val <= alpha_start \
+            else tt.LOWER if best_val >= beta else tt.EXACT
+        tt.store(key, depth, best_val, kind, best_move)
     return best_val
 
 
-def negamax_move(board, k, ox, time_limit=10):
+def negamax_move(board, k, ox, time_limit=10, tt=None, workers=1, seed=None,
+                 limits=None, stats=None, max_depth=None, move_ordering=True,
+                 book=None, exact=None, threat_search=True, pvs=False):
     """Negamax move choosing with alpha-beta pruning performing iterative
-    deepening in given time limit. """
-    start_time = time.time()
-    board_cpy = copy.deepcopy(board)
+    deepening in given time limit (None means no limit) and up to max_depth
+    (None means the end of the game). Instead of time limit SearchLimits can
+    be given as limits, e.g. to limit number of nodes or to cancel the search
+    from another thread. Values of analyzed positions are kept in
+    transposition table tt. Pass the same TranspositionTable to consecutive
+    moves of the game to reuse them, by default a new table is used.
+    Moves are searched in random order - pass seed to make it repeatable.
+    If stats (SearchStats) is given, statistics of the search are collected
+    in it. Moves inside the tree are ordered by MoveOrdering unless
+    move_ordering is False. If book (book.OpeningBook) is given and contains
+    the position, its move is returned without search. The same applies to
+    exact (solver.Solver or solver.Tablebase) choosing perfect moves, e.g.
+    in positions with few empty fields, if it solves the position within
+    limits (by default half of time_limit). Unless threat_search is False,
+    threats.threat_move runs before the search (within limits): a win, the
+    only block of opponent's line or a forced win by continuous threats is
+    played without search; stats record which of these chose the move. If
+    workers is bigger than 1 (or None meaning one per CPU), moves are
+    searched in parallel by processes of parallel.get_pool(workers); then tt
+    and move_ordering aren't used and limits and stats can't be given. If
+    pvs is True, principal variation search with aspiration windows is used
+    instead of plain alpha-beta (see aspiration_deepening). """
+    from ordering import MoveOrdering
+    from threats import threat_move
+    from transposition import TranspositionTable
+    if tt is not None and (tt.n, tt.k) != (len(board), k):
+        raise Exception("Transposition table for different game.")
+    if workers != 1 and (limits is not None or stats is not None):
+        raise Exception("Limits and stats can't be used by parallel search.")
+    own_limits = limits is None
+    if limits is None:
+        limits = SearchLimits(time_limit)
+    move = None
+    if book is not None:
+        if (book.n, book.k) != (len(board), k):
+            raise Exception("Opening book for different game.")
+        move = book.lookup(board, ox)
+        source = 'book'
+    if move is None and exact is not None:
+        if (exact.n, exact.k) != (len(board), k):
+            raise Exception("Exact solver for different game.")
+        # Unless limits were given, the solver can use half of the time, so
+        # the search still has time when the position can't be solved.
+        move = exact.best_move(board, ox, SearchLimits(
+            None if time_limit is None else time_limit / 2)
+            if own_limits else limits)
+        source = 'exact'
+    if move is None and threat_search:
+        found = threat_move(board, k, ox, limits=limits)
+        if found is not None:
+            move = found[0]
+            source = 'threat'
+    if move is not None:
+        if stats is not None:
+            stats.finish(limits, move, source)
+        return move
+    if workers != 1:
+        import parallel
+        return parallel.parallel_negamax_move(
+            board, k, ox, None if time_limit is None
+            else max(0, time_limit - limits.elapsed()), workers, seed,
+            max_depth=max_depth, pvs=pvs)
+    if tt is None:
+        tt = TranspositionTable(len(board), k)
+    tt.new_search()
+    move = (aspiration_deepening if pvs else iterative_deepening)(
+        board, k, ox, limits, tt,
+        random.Random(seed) if seed is not None else random, stats,
+        max_depth, MoveOrdering(len(board)) if move_ordering else None)
+    if stats is not None:
+        stats.finish(limits, move)
+    return move
+
+
+def iterative_deepening(board, k, ox, limits, tt, rand, stats,
+                        max_depth=None, ordering=None):
+    """Performs search of negamax_move and returns the best move. Moves are
+    shuffled with rand (random.Random or random module). """
+    from symmetry import unique_moves
+    from transposition import zobrist_hash
+    from windows import Evaluator
+    board_cpy = copy.deepcopy(board) if isinstance(board, list) \
+        else board.to_board()
     # We need a copy of the board, because exception TimeOut can sometimes be
-    # raised before we undo move.
+    # raised before we undo move. BitBoard is converted to the list board,
+    # because inside the tree Evaluator counts windows incrementally, which
+    # is faster than evaluating bitmasks of the whole board at every node.
     opponent = get_opponent(ox)
+    keys = tt.keys.fields[ox]
+    opponent_key = zobrist_hash(board_cpy, opponent)
+    evaluator = Evaluator(board_cpy, k)
     # Prepare list containing pairs: moves and their values. Initially moves
     # have no values
-    moves_vals = list(map(lambda move: [move, None], empty_fields(board_cpy)))
-    random.shuffle(moves_vals)
+    moves = empty_fields(board_cpy)
+    empty_count = len(moves)
+    # Moves which are transpositions of other moves on a symmetric board lead
+    # to positions of the same value, so only one of them is searched.
+    moves_vals = [[move, None] for move in unique_moves(board_cpy, moves)]
+    rand.shuffle(moves_vals)
+    if max_depth is None or max_depth > empty_count:
+        max_depth = empty_count
     # Iterative deepening:
-    for depth in range(1, 1 + len(empty_fields(board_cpy))):
+    for depth in range(1, 1 + max_depth):
         best_move = moves_vals[0][0]  # because the list is sorted by values
         try:
             local_best_val = -math.inf
             for move_and_val in moves_vals:
                 make_move(board_cpy, move_and_val[0], ox)
+                evaluator.play(move_and_val[0], ox)
                 local_val = \
                     -negamax(board_cpy, k, opponent, depth - 1, -math.inf,
-                             -local_best_val, start_time, time_limit)
+                             -local_best_val, limits, move_and_val[0],
+                             empty_count - 1, tt,
+                             opponent_key ^ keys[move_and_val[0][0]]
+                             [move_and_val[0][1]], evaluator, stats, ordering)
                 make_move(board_cpy, move_and_val[0], '.')  # undo move
+                evaluator.undo(move_and_val[0], ox)
                 # check if it is a winning move and return it if this case:
                 if local_val == math.inf:
                     return move_and_val[0]
@@ -422,6 +638,12 @@ def negamax_move(board, k, ox, time_limit=10):
                     local_best_val = local_val
             # sort by move value from the most powerful to the weakest:
             moves_vals.sort(key=lambda x: x[1], reverse=True)
+            if stats is not None:
+                move, value = moves_vals[0]
+                stats.add_iteration(depth, limits, move, value, [move] + (
+                    tt.principal_variation(
+                        opponent_key ^ keys[move[0]][move[1]], opponent,
+                        depth - 1)))
             if moves_vals[0][1] == -math.inf:
                 # even best move is losing. It makes no sense to analyze deeper
                 return moves_vals[0][0]
@@ -431,14 +653,121 @@ def negamax_move(board, k, ox, time_limit=10):
                 # algorithm, which prunnes them before it realizes that they
                 # are immediately losing
                 moves_vals = [mv for mv in moves_vals if mv[1] > -math.inf]
-                # print('number of considered moves: ' + str(len(moves_vals)))
                 if len(moves_vals) == 1:  # the only move
                     return moves_vals[0][0]
         except TimeOut:
-            # print('depth: %i' % (depth - 1))  # see how deep AI analyzed
             return best_move
-    return moves_vals[0][0]  # return best move, when analyzed whole game.
-    # This can happen if the algorithm solves the game before time elapses
+    return moves_vals[0][0]  # return best move, when analyzed whole game
+    # or max_depth. This can happen if the algorithm solves the game before
+    # time elapses
+
+
+ASPIRATION_WINDOW = 8  # initial half-width of aspiration windows
+
+
+def aspiration_deepening(board, k, ox, limits, tt, rand, stats,
+                         max_depth=None, ordering=None):
+    """Same as iterative_deepening, but every iteration searches with
+    principal variation search in an aspiration window: values from
+    ASPIRATION_WINDOW below to ASPIRATION_WINDOW above the value of the
+    previous iteration. If the value falls outside the window, the window is
+    widened (twice as much every time) on that side and the iteration is
+    repeated. """
+    from symmetry import unique_moves
+    from transposition import zobrist_hash
+    from windows import Evaluator
+    board_cpy = copy.deepcopy(board) if isinstance(board, list) \
+        else board.to_board()
+    opponent = get_opponent(ox)
+    keys = tt.keys.fields[ox]
+    opponent_key = zobrist_hash(board_cpy, opponent)
+    evaluator = Evaluator(board_cpy, k)
+    moves = empty_fields(board_cpy)
+    empty_count = len(moves)
+    moves_vals = [[move, None] for move in unique_moves(board_cpy, moves)]
+    rand.shuffle(moves_vals)
+    if max_depth is None or max_depth > empty_count:
+        max_depth = empty_count
+    value = None
+    for depth in range(1, 1 + max_depth):
+        best_move = moves_vals[0][0]
+        try:
+            if value is None or value in (math.inf, -math.inf):
+                alpha, beta = -math.inf, math.inf
+            else:
+                alpha, beta = value - ASPIRATION_WINDOW, \
+                    value + ASPIRATION_WINDOW
+            delta = ASPIRATION_WINDOW
+            while True:
+                value = search_root(board_cpy, k, ox, depth, alpha, beta,
+                                    moves_vals, limits, empty_count, tt,
+                                    opponent_key, evaluator, stats, ordering)
+                if value == math.inf:
+                    return moves_vals[0][0]
+                delta *= 2
+                if value <= alpha and alpha > -math.inf:
+                    alpha = value - delta
+                elif value >= beta and beta < math.inf:
+                    beta = value + delta
+                else:
+                    break
+            if stats is not None:
+                move = moves_vals[0][0]
+                stats.add_iteration(depth, limits, move, value, [move] + (
+                    tt.principal_variation(
+                        opponent_key ^ keys[move[0]][move[1]], opponent,
+                        depth - 1)))
+            if value == -math.inf:
+                return moves_vals[0][0]
+            moves_vals = [mv for mv in moves_vals if mv[1] > -math.inf]
+            if len(moves_vals) == 1:
+                return moves_vals[0][0]
+        except TimeOut:
+            return best_move
+    return moves_vals[0][0]
+
+
+def search_root(board, k, ox, depth, alpha, beta, moves_vals, limits,
+                empty_count, tt, opponent_key, evaluator, stats, ordering):
+    """Searches moves of moves_vals (pairs [move, value]) with principal
+    variation search in window (alpha, beta) and returns the best value.
+    Values of moves are updated (they are bounds for all moves but the best
+    one) and moves are sorted from the best one. """
+    opponent = get_opponent(ox)
+    keys = tt.keys.fields[ox]
+    best_val = -math.inf
+    for (number, move_and_val) in enumerate(moves_vals):
+        move = move_and_val[0]
+        make_move(board, move, ox)
+        evaluator.play(move, ox)
+        key = opponent_key ^ keys[move[0]][move[1]]
+        try:
+            if number and alpha > -math.inf:
+                value = -negamax(board, k, opponent, depth - 1, -alpha - 1,
+                                 -alpha, limits, move, empty_count - 1, tt,
+                                 key, evaluator, stats, ordering, True)
+                if alpha < value < beta:
+                    value = -negamax(board, k, opponent, depth - 1, -beta,
+                                     -alpha, limits, move, empty_count - 1,
+                                     tt, key, evaluator, stats, ordering,
+                                     True)
+            else:
+                value = -negamax(board, k, opponent, depth - 1, -beta,
+                                 -alpha, limits, move, empty_count - 1, tt,
+                                 key, evaluator, stats, ordering, True)
+        finally:
+            make_move(board, move, '.')
+            evaluator.undo(move, ox)
+        move_and_val[1] = value
+        if value > best_val:
+            best_val = value
+            if value > alpha:
+                alpha = value
+            if value == math.inf or alpha >= beta:
+                break
+    moves_vals.sort(key=lambda x: -math.inf if x[1] is None else x[1],
+                    reverse=True)
+    return best_val
 
 
 ################################################################################
@@ -449,9 +778,9 @@ def main():
     k = 4
 
     # # AI with more time to think (by default 10 seconds):
-    # def negamax_move20(board, k, ox):
-    #     return negamax_move(board, k, ox, 20)
-    # board, result, history = begin(negamax_move20, human_move, n, k)
+    # from engine import Engine
+    # board, result, history = begin(Engine(n, k, time_limit=20), human_move,
+    #                                n, k)
 
     print('AI vs human, board size = %i, number of symbols to win = %i. AI '
           'time limit = 10 s.' % (n, k))
@@ -461,6 +790,9 @@ def main():
     print('Result: ' + result)
 
 
+__all__ = [name for name in globals() if not name.startswith('_')] \
+    + list(_LAZY)  # lazy names are imported by "from tic_tac_toe import *"
+
 if __name__ == "__main__":
     # import doctest
     # doctest.testmod()
@@ -1,3 +1,4 @@
+import random
 import unittest
 from tic_tac_toe import *
 
@@ -51,6 +52,35 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(winner(board, 5), 'o')
         self.assertIsNone(winner(board, 6), None)
 
+    def test_winner_after(self):
+        board = [['.', '.', '.', '.', '.'], ['.', 'x', 'x', '.'],
+                 ['.', '.', 'x'], ['.', 'x'], ['.']]
+        make_move(board, (1, 3), 'x')
+        self.assertEqual(winner_after(board, 3, (1, 3), 'x'), 'x')
+        self.assertIsNone(winner_after(board, 4, (1, 3), 'x'))
+        self.assertEqual(winner_after(board, 4, (1, 3), 'x', 0), '.')
+        make_move(board, (0, 2), 'o')
+        self.assertIsNone(winner_after(board, 2, (0, 2), 'o'))
+        board = [['o', 'o', 'x'], ['x', 'x'], ['.']]
+        make_move(board, (2, 0), 'o')
+        self.assertEqual(winner_after(board, 3, (2, 0), 'o'), '.')
+
+    def test_winner_after_same_as_winner(self):
+        rand = random.Random(0)
+        for n in range(1, 8):
+            for k in range(1, n + 2):
+                board = empty_board(n)
+                moves = empty_fields(board)
+                rand.shuffle(moves)
+                for (number, move) in enumerate(moves):
+                    ox = 'ox'[number % 2]
+                    make_move(board, move, ox)
+                    result = winner_after(board, k, move, ox,
+                                          len(moves) - number - 1)
+                    self.assertEqual(result, winner(board, k))
+                    if result is not None:
+                        break
+
     def test_winner_draw(self):
         board = [['o', 'o', 'x'], ['x', 'x'], ['o']]
         self.assertEqual(winner(board, 3), '.')
@@ -100,3 +130,29 @@ class TestAI(unittest.TestCase):
                  ['.', 'x', 'x', 'o'], ['o', '.', 'o'], ['.', '.'], ['.']]
         self.assertEqual(negamax_move(board, 4, 'o', 1), (3, 1))
         self.assertEqual(negamax_move(board, 4, 'o', 5), (3, 1))
+
+    def test_pvs(self):
+        # Principal variation search finds the same values as alpha-beta
+        rand = random.Random(1)
+        for _ in range(10):
+            board = empty_board(5)
+            for number in range(4):
+                make_move(board, rand.choice(empty_fields(board)),
+                          'ox'[number % 2])
+            for depth in range(1, 4):
+                self.assertEqual(
+                    negamax(board, 3, 'o', depth, -math.inf, math.inf,
+                            SearchLimits(), ordering=MoveOrdering(5),
+                            pvs=True),
+                    negamax(board, 3, 'o', depth, -math.inf, math.inf,
+                            SearchLimits()))
+        board = empty_board(6)
+        board[0][0] = 'o'
+        values = []
+        for pvs in (False, True):
+            stats = SearchStats()
+            negamax_move(board, 4, 'x', None, seed=0, stats=stats,
+                         max_depth=4, pvs=pvs)
+            values.append([iteration.value
+                           for iteration in stats.iterations])
+        self.assertEqual(values[0], values[1])
@@ -0,0 +1,196 @@
+"""Self-play tournaments: many games of AI players played in parallel.
+
+Every game is written as one line of JSON to the results file as soon as it
+ends, and results are aggregated on the fly, so games are never kept in
+memory. Example (1000 games of each pairing on 5 CPUs):
+
+    python tournament.py --n 7 --k 4 --players negamax:random \\
+        negamax:negamax --time-limits 0.1 1 --games 1000 --workers 5 \\
+        --output results.jsonl
+
+Summary of an existing results file:
+
+    python tournament.py --summarize results.jsonl
+"""
+import argparse
+import collections
+import concurrent.futures
+import functools
+import itertools
+import json
+import math
+import os
+import random
+import time
+
+from mcts import mcts_move
+from tic_tac_toe import begin, negamax_move, random_move
+
+
+PLAYERS = {'random': random_move, 'negamax': negamax_move, 'mcts': mcts_move}
+# Players taking time limit as fourth argument:
+TIMED_PLAYERS = {'negamax', 'mcts'}
+
+Config = collections.namedtuple('Config', 'n k o x time_limit')
+
+
+def make_player(name, time_limit):
+    """Returns move choosing function of player with given name."""
+    if name not in PLAYERS:
+        raise Exception("Unknown player: %s." % name)
+    if name in TIMED_PLAYERS:
+        return functools.partial(PLAYERS[name], time_limit=time_limit)
+    return PLAYERS[name]
+
+
+def play_game(config, seed):
+    """Plays one game and returns its record: dictionary with configuration,
+    winner, history as a flat list of coordinates [row, column, row, ...]
+    and think times of moves in milliseconds. """
+    random.seed(seed)
+    times = []
+
+    def timed(choose_move):
+        def choose(board, k, ox):
+            start = time.perf_counter()
+            move = choose_move(board, k, ox)
+            times.append(round((time.perf_counter() - start) * 1000, 1))
+            return move
+        return choose
+
+    _, result, history = begin(
+        timed(make_player(config.o, config.time_limit)),
+        timed(make_player(config.x, config.time_limit)), config.n, config.k)
+    return {'n': config.n, 'k': config.k, 'o': config.o, 'x': config.x,
+            'time_limit': config.time_limit, 'seed': seed, 'winner': result,
+            'moves': len(history),
+            'history': [c for (_, move) in history for c in move],
+            'times': times}
+
+
+def _play(job):
+    return play_game(*job)
+
+
+def configs(ns, ks, pairs, time_limits):
+    """Returns the list of all configurations of the tournament. Pairs are
+    tuples of player names (o, x). Configurations with k > n are skipped. """
+    return [Config(n, k, o, x, time_limit)
+            for (n, k, (o, x), time_limit)
+            in itertools.product(ns, ks, pairs, time_limits) if k <= n]
+
+
+def play_games(configs, games, workers=None, seed=0):
+    """Plays given number of games of each configuration in a process pool
+    and yields game records as soon as they are ready (not necessarily in
+    order). Only a few games per worker are queued at once. """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    jobs = ((config, seed + number) for config in configs
+            for number in range(games))
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        in_flight = set()
+        for job in jobs:
+            in_flight.add(pool.submit(_play, job))
+            if len(in_flight) >= 4 * workers:
+                done, in_flight = concurrent.futures.wait(
+                    in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in concurrent.futures.as_completed(in_flight):
+            yield future.result()
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """Returns Wilson score confidence interval (by default 95%) for the
+    probability of success. """
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials
+                         + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+class Summary:
+    """Aggregated results of games, counted per configuration."""
+
+    def __init__(self):
+        self.results = collections.defaultdict(collections.Counter)
+
+    def add(self, record):
+        config = Config(record['n'], record['k'], record['o'], record['x'],
+                        record['time_limit'])
+        counter = self.results[config]
+        counter[record['winner']] += 1
+        counter['games'] += 1
+        counter['moves'] += record['moves']
+        counter['think_time'] += sum(record['times'])
+
+    def lines(self):
+        """Returns summary as a list of lines of text."""
+        result = ['%3s %3s %8s %8s %6s %6s %-20s %-20s %-20s %6s %9s' % (
+            'n', 'k', 'o', 'x', 'limit', 'games', 'o wins', 'draws',
+            'x wins', 'moves', 'ms/move')]
+        for (config, counter) in sorted(self.results.items()):
+            games = counter['games']
+            rates = []
+            for symbol in 'o.x':
+                low, high = wilson_interval(counter[symbol], games)
+                rates.append('%.3f [%.3f, %.3f]'
+                             % (counter[symbol] / games, low, high))
+            result.append('%3i %3i %8s %8s %6g %6i %s %s %s %6.1f %9.1f' % (
+                config.n, config.k, config.o, config.x, config.time_limit,
+                games, rates[0], rates[1], rates[2], counter['moves'] / games,
+                counter['think_time'] / max(1, counter['moves'])))
+        return result
+
+
+def read_records(path):
+    """Yields game records from the results file one by one."""
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--n', type=int, nargs='+', default=[7])
+    parser.add_argument('--k', type=int, nargs='+', default=[4])
+    parser.add_argument('--players', nargs='+', default=['negamax:random'],
+                        help='pairs of players o:x, available: '
+                             + ', '.join(PLAYERS))
+    parser.add_argument('--time-limits', type=float, nargs='+',
+                        default=[1.0])
+    parser.add_argument('--games', type=int, default=100,
+                        help='number of games of each configuration')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='tournament.jsonl',
+                        help='file to which game records are appended')
+    parser.add_argument('--summarize', metavar='FILE',
+                        help='only print summary of existing results file')
+    args = parser.parse_args()
+
+    summary = Summary()
+    if args.summarize:
+        for record in read_records(args.summarize):
+            summary.add(record)
+    else:
+        pairs = [tuple(pair.split(':')) for pair in args.players]
+        with open(args.output, 'a') as output:
+            for record in play_games(
+                    configs(args.n, args.k, pairs, args.time_limits),
+                    args.games, args.workers, args.seed):
+                output.write(json.dumps(record, separators=(',', ':'))
+                             + '\n')
+                output.flush()
+                summary.add(record)
+    print('\n'.join(summary.lines()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import unittest
+from tic_tac_toe import *
+from tournament import Config, Summary, configs, play_game, play_games, \
+    wilson_interval
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_configs(self):
+        self.assertEqual(configs([3, 4], [4], [('random', 'negamax')], [1]),
+                         [Config(4, 4, 'random', 'negamax', 1)])
+
+    def test_play_game(self):
+        config = Config(4, 3, 'random', 'random', 1)
+        record = play_game(config, 7)
+        self.assertEqual(record['history'], play_game(config, 7)['history'])
+        self.assertEqual(len(record['history']), 2 * record['moves'])
+        self.assertEqual(len(record['times']), record['moves'])
+        board = empty_board(4)
+        for number in range(record['moves']):
+            make_move(board, record['history'][2 * number:2 * number + 2],
+                      'ox'[number % 2])
+        if record['winner'] == '.':
+            self.assertTrue(is_draw(board, 3))
+        else:
+            self.assertEqual(winner(board, 3), record['winner'])
+
+    def test_play_games(self):
+        records = list(play_games([Config(3, 3, 'random', 'random', 1),
+                                   Config(4, 3, 'negamax', 'random', 0.01)],
+                                  5, workers=2))
+        self.assertEqual(len(records), 10)
+        summary = Summary()
+        for record in records:
+            summary.add(record)
+        self.assertEqual(len(summary.lines()), 3)
+
+    def test_wilson_interval(self):
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, 3)
+        self.assertAlmostEqual(high, 0.5962, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
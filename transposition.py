@@ -0,0 +1,114 @@
+"""Transposition table for negamax keyed by Zobrist hashes.
+
+Zobrist hash of a position is XOR of random keys of all its symbols (a key
+per field and symbol) and of an additional key when x is to move. Playing or
+undoing a move changes the hash by XOR of two keys, so negamax updates it
+incrementally.
+"""
+import collections
+import functools
+import random
+
+
+# Kinds of values stored in the table:
+EXACT = 0  # exact value of the position
+LOWER = 1  # value is at least stored value (search was cut off)
+UPPER = 2  # value is at most stored value (no move exceeded alpha)
+
+ZobristKeys = collections.namedtuple('ZobristKeys', 'fields side')
+# fields - fields[ox][i][j] is a key of symbol ox on field (i, j),
+# side - key of x to move.
+
+
+@functools.lru_cache(maxsize=None)
+def zobrist_keys(n):
+    """Returns ZobristKeys for the board of size n. Keys are pseudo-random,
+    but the same in every process, so hashes can be stored in files and
+    compared between processes. """
+    rand = random.Random('zobrist %i' % n)
+    fields = {ox: [[rand.getrandbits(64) for j in range(n - i)]
+                   for i in range(n)] for ox in 'ox'}
+    return ZobristKeys(fields, rand.getrandbits(64))
+
+
+def zobrist_hash(board, ox):
+    """Returns Zobrist hash of the board with ox to move."""
+    if not isinstance(board, list):
+        board = board.to_board()  # BitBoard
+    keys = zobrist_keys(len(board))
+    result = keys.side if ox == 'x' else 0
+    for (i, row) in enumerate(board):
+        for (j, content) in enumerate(row):
+            if content != '.':
+                result ^= keys.fields[content][i][j]
+    return result
+
+
+class TranspositionTable:
+    """Table of negamax results for games on the board of size n with k
+    symbols in a line needed to win. Entries are tuples (key, depth, value,
+    kind, best move, search number).
+
+    The table has at most max_entries entries kept in buckets of two. The
+    first entry of a bucket is replaced only by a result of a search at least
+    as deep or by any result of a newer search (see new_search). The second
+    entry takes all results that don't fit into the first one. """
+    EXACT, LOWER, UPPER = EXACT, LOWER, UPPER  # kinds, for negamax
+
+    def __init__(self, n, k, max_entries=1 << 18):
+        self.n = n
+        self.k = k
+        self.keys = zobrist_keys(n)
+        self.size = max(1, max_entries // 2)
+        self.search = 0
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+
+    def __len__(self):
+        return sum(entry is not None for entry in self.deep) \
+            + sum(entry is not None for entry in self.recent)
+
+    def new_search(self):
+        """Marks the beginning of the next move search. Results of earlier
+        searches remain usable, but no longer block deeper buckets. """
+        self.search += 1
+
+    def clear(self):
+        """Removes all entries from the table."""
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+
+    def lookup(self, key):
+        """Returns the entry for the position with given hash or None."""
+        index = key % self.size
+        entry = self.deep[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, value, kind, move):
+        index = key % self.size
+        entry = (key, depth, value, kind, move, self.search)
+        deep = self.deep[index]
+        if deep is None or depth >= deep[1] or deep[5] != self.search:
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+    def principal_variation(self, key, ox, length):
+        """Returns the list of up to length best moves stored for the
+        position with given hash and ox to move and for the following
+        positions. """
+        result = []
+        while len(result) < length:
+            entry = self.lookup(key)
+            if entry is None or entry[4] in result:
+                break
+            move = entry[4]
+            result.append(move)
+            key ^= self.keys.fields[ox][move[0]][move[1]] ^ self.keys.side
+            ox = 'x' if ox == 'o' else 'o'
+        return result
@@ -0,0 +1,73 @@
+import math
+import random
+import unittest
+from tic_tac_toe import *
+from transposition import EXACT, LOWER, UPPER, zobrist_keys
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_zobrist_hash(self):
+        board = empty_board(4)
+        self.assertEqual(zobrist_hash(board, 'o'), 0)
+        self.assertEqual(zobrist_hash(board, 'x'), zobrist_keys(4).side)
+        make_move(board, (1, 2), 'o')
+        make_move(board, (0, 0), 'x')
+        keys = zobrist_keys(4).fields
+        self.assertEqual(zobrist_hash(board, 'o'),
+                         keys['o'][1][2] ^ keys['x'][0][0])
+        self.assertEqual(zobrist_hash(BitBoard.from_board(board), 'o'),
+                         zobrist_hash(board, 'o'))
+        self.assertNotEqual(zobrist_hash(board, 'o'), zobrist_hash(board, 'x'))
+
+    def test_store_and_lookup(self):
+        tt = TranspositionTable(3, 3, 8)
+        self.assertIsNone(tt.lookup(5))
+        tt.store(5, 2, 7, EXACT, (0, 1))
+        self.assertEqual(tt.lookup(5)[:5], (5, 2, 7, EXACT, (0, 1)))
+        # Shallower result doesn't replace deeper one:
+        tt.store(9, 1, 3, LOWER, (1, 1))
+        self.assertEqual(tt.lookup(5)[1], 2)
+        self.assertEqual(tt.lookup(9)[1], 1)
+        # ...but it does after new search starts:
+        tt.new_search()
+        tt.store(13, 0, 1, UPPER, (2, 0))
+        self.assertIsNone(tt.lookup(5))
+        self.assertEqual(tt.lookup(13)[2], 1)
+        self.assertEqual(tt.lookup(9)[2], 3)
+
+    def test_bounded_size(self):
+        tt = TranspositionTable(3, 3, 16)
+        for key in range(1000):
+            tt.store(key, key % 5, 0, EXACT, (0, 0))
+        self.assertLessEqual(len(tt), 16)
+
+    def test_negamax_values(self):
+        # Transposition table must not change values of fixed depth search.
+        rand = random.Random(0)
+        for (n, k, depth) in (3, 3, 9), (4, 3, 5), (5, 3, 3), (5, 4, 3):
+            board = empty_board(n)
+            for _ in range(3):
+                tt = TranspositionTable(n, k)
+                for ox in 'ox':
+                    self.assertEqual(
+                        negamax(board, k, ox, depth, -math.inf, math.inf,
+                                SearchLimits()),
+                        negamax(board, k, ox, depth, -math.inf, math.inf,
+                                SearchLimits(), tt=tt,
+                                key=zobrist_hash(board, ox)))
+                make_move(board, rand.choice(empty_fields(board)), 'o')
+                make_move(board, rand.choice(empty_fields(board)), 'x')
+
+    def test_reuse_between_moves(self):
+        board = [['.', '.', 'o'], ['x', 'o'], ['.']]
+        tt = TranspositionTable(3, 3)
+        self.assertEqual(negamax_move(board, 3, 'x', 1, tt,
+                                      threat_search=False), (2, 0))
+        self.assertGreater(len(tt), 0)
+        with self.assertRaises(Exception):
+            negamax_move(board, 2, 'x', 1, tt)
+
+
+if __name__ == '__main__':
+    unittest.main()
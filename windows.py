@@ -0,0 +1,223 @@
+"""Windows - lines of k fields in which a player can score k symbols.
+
+The windows of the board of size n are computed once per (n, k) and shared by
+heuristics, the bitboard and the incremental Evaluator used by negamax.
+"""
+import functools
+import math
+
+
+@functools.lru_cache(maxsize=None)
+def winning_windows(n, k):
+    """Returns a tuple of all windows on the board of size n. A window is a
+    tuple of k fields. Windows are ordered in the same way as heuristics
+    scans the board: by the first field and then by direction. """
+    result = []
+    for i in range(n):
+        for j in range(n - i):
+            for (x, y) in (0, 1), (-1, 0), (-1, 1), (-1, -1):
+                i_last, j_last = i + (k - 1) * x, j + (k - 1) * y
+                if i_last + j_last >= n or i_last < 0 or j_last < 0:
+                    continue
+                result.append(tuple((i + m * x, j + m * y) for m in range(k)))
+    return tuple(result)
+
+
+@functools.lru_cache(maxsize=None)
+def field_windows(n, k):
+    """Returns a board-shaped list: field_windows(n, k)[i][j] is a tuple of
+    numbers of windows (indexes in winning_windows(n, k)) containing field
+    (i, j). """
+    result = [[[] for j in range(n - i)] for i in range(n)]
+    for (number, window) in enumerate(winning_windows(n, k)):
+        for (i, j) in window:
+            result[i][j].append(number)
+    return [[tuple(numbers) for numbers in row] for row in result]
+
+
+@functools.lru_cache(maxsize=None)
+def neighbour_fields(n):
+    """Returns a board-shaped list: neighbour_fields(n)[i][j] is a tuple of
+    fields adjacent to (i, j) horizontally, vertically or diagonally. """
+    return [[tuple((i + x, j + y) for x in (-1, 0, 1) for y in (-1, 0, 1)
+                   if (x, y) != (0, 0) and i + x >= 0 and j + y >= 0
+                   and i + x + j + y < n)
+             for j in range(n - i)] for i in range(n)]
+
+
+@functools.lru_cache(maxsize=None)
+def board_fields(n):
+    """Returns a tuple of all fields of the board of size n in row-major
+    order. Index of a field in it (see field_index) is a one-number
+    representation of the field used in files. """
+    return tuple((i, j) for i in range(n) for j in range(n - i))
+
+
+def field_index(n, field):
+    """Returns index of the field in board_fields(n)."""
+    i, j = field
+    return i * n - i * (i - 1) // 2 + j
+
+
+class Evaluator:
+    """Keeps heuristics value of the board up to date while moves are played
+    and undone. For every window it counts o and x symbols in it, so playing
+    a move costs only as much as the number of windows through its field.
+    It also counts dead windows (containing both symbols) to recognize
+    drawn positions immediately. For move ordering it keeps a copy of the
+    board, numbers of stones adjacent to every field and threats (their
+    numbers and sets of their windows): windows in which a player misses
+    only one symbol. Evaluator must be informed about every move by play and
+    undo. """
+
+    def __init__(self, board, k):
+        if not isinstance(board, list):
+            board = board.to_board()  # BitBoard
+        n = len(board)
+        self.k = k
+        self.windows = winning_windows(n, k)
+        self.field_windows = field_windows(n, k)
+        self.neighbour_fields = neighbour_fields(n)
+        self.o_counts = [0] * len(self.windows)
+        self.x_counts = [0] * len(self.windows)
+        self.value = 0  # heuristics from o's viewpoint unless game is over
+        self.o_lines = 0  # numbers of windows filled by one player
+        self.x_lines = 0
+        self.o_threats = 0  # numbers of windows with k - 1 symbols of one
+        self.x_threats = 0  # player and no symbols of the other one
+        self.o_threat_windows = set()  # indexes of such windows
+        self.x_threat_windows = set()
+        self.dead = 0  # number of windows containing both symbols
+        self.board = [['.'] * (n - i) for i in range(n)]
+        self.adjacent = [[0] * (n - i) for i in range(n)]
+        for (i, row) in enumerate(board):
+            for (j, content) in enumerate(row):
+                if content != '.':
+                    self.play((i, j), content)
+
+    def play(self, field, ox):
+        """Updates counts after ox was put on the field."""
+        if ox == 'o':
+            counts, other_counts, sign = self.o_counts, self.x_counts, 1
+            threat_windows = self.o_threat_windows
+            other_threat_windows = self.x_threat_windows
+        else:
+            counts, other_counts, sign = self.x_counts, self.o_counts, -1
+            threat_windows = self.x_threat_windows
+            other_threat_windows = self.o_threat_windows
+        k = self.k
+        change = lines = threats = other_threats = 0
+        for window in self.field_windows[field[0]][field[1]]:
+            count = counts[window]
+            counts[window] = count + 1
+            other_count = other_counts[window]
+            if other_count == 0:
+                change += 1  # ox's window got one more symbol
+                if count + 2 == k:
+                    threats += 1
+                    threat_windows.add(window)
+                elif count + 1 == k:
+                    threats -= 1
+                    lines += 1
+                    threat_windows.discard(window)
+            elif count == 0:
+                change += other_count  # opponent's window got blocked
+                self.dead += 1
+                if other_count + 1 == k:
+                    other_threats += 1
+                    other_threat_windows.discard(window)
+        self.value += sign * change
+        if ox == 'o':
+            self.o_lines += lines
+            self.o_threats += threats
+            self.x_threats -= other_threats
+        else:
+            self.x_lines += lines
+            self.x_threats += threats
+            self.o_threats -= other_threats
+        self.board[field[0]][field[1]] = ox
+        adjacent = self.adjacent
+        for (i, j) in self.neighbour_fields[field[0]][field[1]]:
+            adjacent[i][j] += 1
+
+    def undo(self, field, ox):
+        """Updates counts after ox was removed from the field."""
+        if ox == 'o':
+            counts, other_counts, sign = self.o_counts, self.x_counts, 1
+            threat_windows = self.o_threat_windows
+            other_threat_windows = self.x_threat_windows
+        else:
+            counts, other_counts, sign = self.x_counts, self.o_counts, -1
+            threat_windows = self.x_threat_windows
+            other_threat_windows = self.o_threat_windows
+        k = self.k
+        change = lines = threats = other_threats = 0
+        for window in self.field_windows[field[0]][field[1]]:
+            count = counts[window] - 1
+            counts[window] = count
+            other_count = other_counts[window]
+            if other_count == 0:
+                change += 1
+                if count + 2 == k:
+                    threats += 1
+                    threat_windows.discard(window)
+                elif count + 1 == k:
+                    threats -= 1
+                    lines += 1
+                    threat_windows.add(window)
+            elif count == 0:
+                change += other_count
+                self.dead -= 1
+                if other_count + 1 == k:
+                    other_threats += 1
+                    other_threat_windows.add(window)
+        self.value -= sign * change
+        if ox == 'o':
+            self.o_lines -= lines
+            self.o_threats -= threats
+            self.x_threats += other_threats
+        else:
+            self.x_lines -= lines
+            self.x_threats -= threats
+            self.o_threats += other_threats
+        self.board[field[0]][field[1]] = '.'
+        adjacent = self.adjacent
+        for (i, j) in self.neighbour_fields[field[0]][field[1]]:
+            adjacent[i][j] -= 1
+
+    def threat_fields(self, ox):
+        """Returns the list of empty fields on which ox would complete a
+        line. Only windows of ox's threats (kept up to date by play and
+        undo) are checked, in the order of windows. """
+        threat_windows = self.o_threat_windows if ox == 'o' \
+            else self.x_threat_windows
+        if not threat_windows:
+            return []
+        result = []
+        board = self.board
+        for window in sorted(threat_windows):
+            for (i, j) in self.windows[window]:
+                if board[i][j] == '.' and (i, j) not in result:
+                    result.append((i, j))
+        return result
+
+    def is_draw(self):
+        """Returns the same value as is_draw(board, k): True when every
+        window contains both symbols, so nobody can win anymore. """
+        return self.dead == len(self.windows)
+
+    def heuristics(self, ox):
+        """Returns the same value as heuristics(board, k, ox)."""
+        if self.o_lines or self.x_lines:
+            if not self.x_lines:
+                who = 'o'
+            elif not self.o_lines:
+                who = 'x'
+            else:
+                # Both players have lines - heuristics chooses the first one.
+                who = next('o' if o_count == self.k else 'x'
+                           for (o_count, x_count)
+                           in zip(self.o_counts, self.x_counts)
+                           if self.k in (o_count, x_count))
+            return math.inf if who == ox else -math.inf
+        return self.value if ox == 'o' else -self.value
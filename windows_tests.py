@@ -0,0 +1,106 @@
+import math
+import random
+import unittest
+from tic_tac_toe import *
+from windows import field_windows
+
+
+class TestWindows(unittest.TestCase):
+
+    def test_winning_windows(self):
+        self.assertEqual(winning_windows(3, 3),
+                         (((0, 0), (0, 1), (0, 2)), ((2, 0), (1, 0), (0, 0)),
+                          ((2, 0), (1, 1), (0, 2))))
+        self.assertEqual(len(winning_windows(3, 2)), 10)
+        self.assertEqual(winning_windows(3, 4), ())
+        self.assertIs(winning_windows(7, 4), winning_windows(7, 4))
+
+    def test_field_windows(self):
+        windows = winning_windows(6, 3)
+        numbers = field_windows(6, 3)
+        for (i, row) in enumerate(numbers):
+            for (j, field_numbers) in enumerate(row):
+                self.assertEqual(
+                    field_numbers,
+                    tuple(number for (number, window) in enumerate(windows)
+                          if (i, j) in window))
+
+
+class TestEvaluator(unittest.TestCase):
+
+    def test_initial_value(self):
+        board = [['x', '.', '.'], ['.', 'o'], ['.']]
+        self.assertEqual(Evaluator(board, 3).heuristics('x'), 1)
+        self.assertEqual(Evaluator(BitBoard.from_board(board), 3)
+                         .heuristics('o'), -1)
+
+    def test_play_and_undo(self):
+        rand = random.Random(0)
+        for n in range(1, 8):
+            for k in range(1, n + 2):
+                board = empty_board(n)
+                evaluator = Evaluator(board, k)
+                moves = empty_fields(board)
+                rand.shuffle(moves)
+                for (number, move) in enumerate(moves):
+                    ox = 'ox'[number % 2]
+                    make_move(board, move, ox)
+                    evaluator.play(move, ox)
+                    for who in 'ox':
+                        self.assertEqual(evaluator.heuristics(who),
+                                         heuristics(board, k, who))
+                    self.assertEqual(evaluator.is_draw(), is_draw(board, k))
+                    if k > 1:
+                        self.check_threats(evaluator, board, k)
+                for (number, move) in reversed(list(enumerate(moves))):
+                    make_move(board, move, '.')
+                    evaluator.undo(move, 'ox'[number % 2])
+                    self.assertEqual(evaluator.heuristics('o'),
+                                     heuristics(board, k, 'o'))
+                    self.assertEqual(evaluator.is_draw(), is_draw(board, k))
+                    if k > 1:
+                        self.check_threats(evaluator, board, k)
+                self.assertEqual(evaluator.heuristics('o'), 0)
+
+    def check_threats(self, evaluator, board, k):
+        for ox in 'ox':
+            fields = set()
+            threats = 0
+            for window in winning_windows(len(board), k):
+                contents = [board[i][j] for (i, j) in window]
+                if contents.count(ox) == k - 1 and contents.count('.') == 1:
+                    threats += 1
+                    fields.add(window[contents.index('.')])
+            self.assertEqual(set(evaluator.threat_fields(ox)), fields)
+            self.assertEqual(evaluator.o_threats if ox == 'o'
+                             else evaluator.x_threats, threats)
+            self.assertEqual(len(evaluator.o_threat_windows if ox == 'o'
+                                 else evaluator.x_threat_windows), threats)
+        self.assertEqual(evaluator.board, board)
+
+    def test_drawn_position(self):
+        board = [['o', '.', 'x'], ['x', 'x'], ['o']]
+        evaluator = Evaluator(board, 3)
+        self.assertTrue(evaluator.is_draw())
+        evaluator.undo((0, 2), 'x')
+        self.assertFalse(evaluator.is_draw())
+        # Search stops at drawn positions:
+        limits = SearchLimits()
+        self.assertEqual(negamax(board, 3, 'o', 5, -math.inf, math.inf,
+                                 limits, evaluator=Evaluator(board, 3)), 0)
+        self.assertEqual(limits.nodes, 1)
+
+    def test_negamax_values(self):
+        board = [['.', 'x', 'o', '.', '.', '.'], ['.', 'x', 'x', 'o', '.'],
+                 ['.', 'x', '.', 'o'], ['o', '.', '.'], ['.', '.'], ['.']]
+        for depth in range(4):
+            self.assertEqual(
+                negamax(board, 4, 'o', depth, -math.inf, math.inf,
+                        SearchLimits()),
+                negamax(board, 4, 'o', depth, -math.inf, math.inf,
+                        SearchLimits(),
+                        evaluator=Evaluator(board, 4)))
+
+
+if __name__ == '__main__':
+    unittest.main()